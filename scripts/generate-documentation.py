@@ -6,13 +6,14 @@ Generates documentation from Ansible metadata, playbooks, and roles
 
 import os
 import sys
+import getopt
 import yaml
 import json
-import argparse
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import re
 from datetime import datetime
+from functools import lru_cache
 import logging
 
 # Configure logging
@@ -22,6 +23,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Static text blocks spliced into generated documents
+RESOURCES_PATH = Path(__file__).resolve().parent / "resources"
+
+@lru_cache(maxsize=None)
+def _diagram(name: str) -> str:
+    """Load an ASCII diagram from the resources directory (cached after first read)"""
+    return (RESOURCES_PATH / name).read_text(encoding='utf-8').rstrip('\n')
+
+def _timestamp() -> str:
+    """Return the current local time as 'YYYY-MM-DD HH:MM:SS'"""
+    n = datetime.now()
+    return f"{n.year:04d}-{n.month:02d}-{n.day:02d} {n.hour:02d}:{n.minute:02d}:{n.second:02d}"
+
 class DocumentationGenerator:
     """Generates comprehensive documentation from Ansible metadata"""
     
@@ -35,30 +49,53 @@ class DocumentationGenerator:
         # Ensure docs directory exists
         self.docs_path.mkdir(exist_ok=True)
         
+        # Open docs directory fd, only held during generate_all_documentation
+        self._docs_dir_fd: Optional[int] = None
+        
     def generate_all_documentation(self):
         """Generate all documentation types"""
         logger.info("Starting comprehensive documentation generation...")
         
-        # Generate role documentation
-        self.generate_role_documentation()
-        
-        # Generate playbook documentation
-        self.generate_playbook_documentation()
-        
-        # Generate inventory documentation
-        self.generate_inventory_documentation()
-        
-        # Generate API documentation
-        self.generate_api_documentation()
+        # Resolve the docs directory once and create files relative to it
+        if os.open in os.supports_dir_fd:
+            self._docs_dir_fd = os.open(self.docs_path, os.O_RDONLY | os.O_DIRECTORY)
         
-        # Generate architecture documentation
-        self.generate_architecture_documentation()
-        
-        # Generate index page
-        self.generate_index_documentation()
+        try:
+            # Generate role documentation
+            self.generate_role_documentation()
+            
+            # Generate playbook documentation
+            self.generate_playbook_documentation()
+            
+            # Generate inventory documentation
+            self.generate_inventory_documentation()
+            
+            # Generate API documentation
+            self.generate_api_documentation()
+            
+            # Generate architecture documentation
+            self.generate_architecture_documentation()
+            
+            # Generate index page
+            self.generate_index_documentation()
+        finally:
+            if self._docs_dir_fd is not None:
+                os.close(self._docs_dir_fd)
+                self._docs_dir_fd = None
         
         logger.info("Documentation generation completed successfully!")
     
+    def _write_doc(self, doc_file: Path, content: str):
+        """Write a generated document, relative to the open docs directory fd when available"""
+        if self._docs_dir_fd is not None and doc_file.parent == self.docs_path:
+            fd = os.open(doc_file.name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644,
+                         dir_fd=self._docs_dir_fd)
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+        else:
+            with open(doc_file, 'w') as f:
+                f.write(content)
+    
     def generate_role_documentation(self):
         """Generate documentation for all Ansible roles"""
         logger.info("Generating role documentation...")
@@ -278,11 +315,10 @@ ansible-playbook playbook.yml --tags "tag_name"
 ```
 
 ---
-*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*Generated on {_timestamp()}*
 """
         
-        with open(doc_file, 'w') as f:
-            f.write(content)
+        self._write_doc(doc_file, content)
         
         logger.info(f"Generated documentation for role: {role_name}")
     
@@ -358,11 +394,10 @@ This directory contains documentation for all Ansible roles in the VPN Infrastru
 ```
 
 ---
-*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*Generated on {_timestamp()}*
 """
         
-        with open(index_file, 'w') as f:
-            f.write(content)
+        self._write_doc(index_file, content)
     
     def generate_playbook_documentation(self):
         """Generate documentation for all playbooks"""
@@ -553,11 +588,10 @@ Use tags to run specific parts of playbooks:
 - `--tags validate` - Validation and testing
 
 ---
-*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*Generated on {_timestamp()}*
 """
         
-        with open(index_file, 'w') as f:
-            f.write(content)
+        self._write_doc(index_file, content)
     
     def generate_inventory_documentation(self):
         """Generate documentation for inventory structure"""
@@ -713,11 +747,10 @@ ansible-playbook playbook.yml \\
 5. **Version control all changes**
 
 ---
-*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*Generated on {_timestamp()}*
 """
         
-        with open(inventory_doc_file, 'w') as f:
-            f.write(content)
+        self._write_doc(inventory_doc_file, content)
     
     def generate_api_documentation(self):
         """Generate API documentation"""
@@ -1042,11 +1075,10 @@ openssl s_client -connect server.example.com:10086 -servername server.example.co
 - **Authentication:** Required for management APIs
 
 ---
-*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*Generated on {_timestamp()}*
 """
         
-        with open(api_doc_file, 'w') as f:
-            f.write(content)
+        self._write_doc(api_doc_file, content)
     
     def generate_architecture_documentation(self):
         """Generate architecture documentation"""
@@ -1063,35 +1095,11 @@ The VPN Infrastructure DevOps Controller implements a distributed architecture s
 ## High-Level Architecture
 
 ```
-┌─────────────────────────────────────────────────────────────────┐
-│                        CONTROL PLANE                            │
-│  ┌─────────────────┐  ┌─────────────────┐  ┌─────────────────┐ │
-│  │   Ansible       │  │   Monitoring    │  │   Security      │ │
-│  │   Controller    │  │   Stack         │  │   Management    │ │
-│  │                 │  │                 │  │                 │ │
-│  │ • Semaphore UI  │  │ • Grafana       │  │ • Vault         │ │
-│  │ • AWX Platform  │  │ • Prometheus    │  │ • CrowdSec LAPI │ │
-│  │ • Playbooks     │  │ • Loki          │  │ • Certificate   │ │
-│  │ • Inventory     │  │ • AlertManager  │  │   Management    │ │
-│  └─────────────────┘  └─────────────────┘  └─────────────────┘ │
-└─────────────────────────────────────────────────────────────────┘
+{_diagram('control-plane.txt')}
                                 │
                                 │ Management & Monitoring
                                 ▼
-┌─────────────────────────────────────────────────────────────────┐
-│                        EDGE LAYER                               │
-│                                                                 │
-│  ┌─────────────────┐  ┌─────────────────┐  ┌─────────────────┐ │
-│  │   EUROPE (10)   │  │ NORTH AMERICA   │  │ ASIA PACIFIC    │ │
-│  │                 │  │     (10)        │  │     (10)        │ │
-│  │ • WireGuard     │  │ • WireGuard     │  │ • WireGuard     │ │
-│  │ • OpenVPN       │  │ • OpenVPN       │  │ • OpenVPN       │ │
-│  │ • AmneziaWG     │  │ • AmneziaWG     │  │ • AmneziaWG     │ │
-│  │ • CoreDNS       │  │ • CoreDNS       │  │ • CoreDNS       │ │
-│  │ • Monitoring    │  │ • Monitoring    │  │ • Monitoring    │ │
-│  │ • Security      │  │ • Security      │  │ • Security      │ │
-│  └─────────────────┘  └─────────────────┘  └─────────────────┘ │
-└─────────────────────────────────────────────────────────────────┘
+{_diagram('edge-layer.txt')}
 ```
 
 ## Component Architecture
@@ -1347,11 +1355,10 @@ Internet
 - **Firewall:** UFW (Uncomplicated Firewall)
 
 ---
-*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*Generated on {_timestamp()}*
 """
         
-        with open(arch_doc_file, 'w') as f:
-            f.write(content)
+        self._write_doc(arch_doc_file, content)
     
     def generate_index_documentation(self):
         """Generate main documentation index"""
@@ -1555,42 +1562,76 @@ ansible-playbook playbooks/generate-configurations.yml
 
 ---
 
-**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**Last Updated:** {_timestamp()}  
 **Generated By:** Automated Documentation Generator  
 **Version:** 1.0.0
 """
         
-        with open(index_file, 'w') as f:
-            f.write(content)
+        self._write_doc(index_file, content)
+
+DOC_TYPES = ('all', 'roles', 'playbooks', 'inventory', 'api', 'architecture', 'index')
+
+USAGE = f"""usage: generate-documentation.py [-h] [--path PATH] [--type {{{','.join(DOC_TYPES)}}}] [--verbose]
+
+Generate VPN Infrastructure documentation
+
+options:
+  -h, --help            show this help message and exit
+  --path PATH, -p PATH  Base path (default: current directory)
+  --type TYPE, -t TYPE  Documentation type to generate: {', '.join(DOC_TYPES)} (default: all)
+  --verbose, -v         Enable verbose logging
+"""
+
+def parse_args(argv: List[str]) -> Dict[str, Any]:
+    """Parse command line flags with getopt (avoids argparse start-up cost)"""
+    def usage_error(message: str):
+        sys.stderr.write(USAGE.split('\n\n', 1)[0] + f"\ngenerate-documentation.py: error: {message}\n")
+        sys.exit(2)
+    
+    try:
+        opts, extra = getopt.gnu_getopt(argv, "hp:t:v", ["help", "path=", "type=", "verbose"])
+    except getopt.GetoptError as e:
+        usage_error(str(e))
+    if extra:
+        usage_error(f"unrecognized arguments: {' '.join(extra)}")
+    
+    args = {'path': '.', 'type': 'all', 'verbose': False}
+    for opt, value in opts:
+        if opt in ("-h", "--help"):
+            sys.stdout.write(USAGE)
+            sys.exit(0)
+        elif opt in ("-p", "--path"):
+            args['path'] = value
+        elif opt in ("-t", "--type"):
+            if value not in DOC_TYPES:
+                usage_error(f"argument --type/-t: invalid choice: '{value}'")
+            args['type'] = value
+        elif opt in ("-v", "--verbose"):
+            args['verbose'] = True
+    return args
 
 def main():
     """Main function"""
-    parser = argparse.ArgumentParser(description="Generate VPN Infrastructure documentation")
-    parser.add_argument("--path", "-p", default=".", help="Base path (default: current directory)")
-    parser.add_argument("--type", "-t", choices=['all', 'roles', 'playbooks', 'inventory', 'api', 'architecture', 'index'], 
-                       default='all', help="Documentation type to generate")
-    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
-    
-    args = parser.parse_args()
+    args = parse_args(sys.argv[1:])
     
-    if args.verbose:
+    if args['verbose']:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    generator = DocumentationGenerator(args.path)
+    generator = DocumentationGenerator(args['path'])
     
-    if args.type == 'all':
+    if args['type'] == 'all':
         generator.generate_all_documentation()
-    elif args.type == 'roles':
+    elif args['type'] == 'roles':
         generator.generate_role_documentation()
-    elif args.type == 'playbooks':
+    elif args['type'] == 'playbooks':
         generator.generate_playbook_documentation()
-    elif args.type == 'inventory':
+    elif args['type'] == 'inventory':
         generator.generate_inventory_documentation()
-    elif args.type == 'api':
+    elif args['type'] == 'api':
         generator.generate_api_documentation()
-    elif args.type == 'architecture':
+    elif args['type'] == 'architecture':
         generator.generate_architecture_documentation()
-    elif args.type == 'index':
+    elif args['type'] == 'index':
         generator.generate_index_documentation()
 
 if __name__ == "__main__":
@@ -8,20 +8,223 @@ import json
 import yaml
 import sys
 import os
+import re
+import glob
+import pickle
 import argparse
-from typing import Dict, List, Any, Set
+import multiprocessing
+from typing import Any, BinaryIO, Callable, DefaultDict, Dict, IO, List, Optional, Tuple
 import logging
+from bisect import bisect_left
 from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from operator import attrgetter
+
+# Use the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# orjson is optional; stdlib json is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Host var fields checked, in priority order, by the extract_* methods
+REGION_FIELDS = ('server_region', 'region', 'aws_region', 'gcp_zone', 'azure_region')
+PROVIDER_FIELDS = ('cloud_provider', 'provider', 'aws_provider', 'gcp_provider')
+ENVIRONMENT_TAG_FIELDS = ('Environment', 'environment', 'Env', 'env')
+
+# Variables applied to regional and protocol groups by apply_group_variables
+REGIONAL_VARS = {
+    'europe': {
+        'ntp_servers': ['0.europe.pool.ntp.org', '1.europe.pool.ntp.org'],
+        'dns_servers': ['1.1.1.1', '8.8.8.8'],
+        'timezone': 'Europe/London'
+    },
+    'north_america': {
+        'ntp_servers': ['0.north-america.pool.ntp.org', '1.north-america.pool.ntp.org'],
+        'dns_servers': ['1.1.1.1', '8.8.8.8'],
+        'timezone': 'America/New_York'
+    },
+    'asia_pacific': {
+        'ntp_servers': ['0.asia.pool.ntp.org', '1.asia.pool.ntp.org'],
+        'dns_servers': ['1.1.1.1', '8.8.8.8'],
+        'timezone': 'Asia/Singapore'
+    }
+}
+
+PROTOCOL_VARS = {
+    'wireguard_servers': {
+        'wireguard_port': 51820,
+        'wireguard_dashboard_port': 10086,
+        'wireguard_interface': 'wg0'
+    },
+    'openvpn_servers': {
+        'openvpn_port': 1194,
+        'openvpn_protocol': 'udp',
+        'openvpn_cipher': 'AES-256-GCM'
+    },
+    'amneziawg_servers': {
+        'amneziawg_port': 51821,
+        'amneziawg_interface': 'awg0'
+    }
+}
+
+# Leading instance-type family including its separator, e.g. 't3.', 'n2-', 'Standard_'
+INSTANCE_FAMILY_RE = re.compile(r'[^._-]*[._-]')
+
+# Instance-type family -> cloud provider, used when no provider field is set
+INSTANCE_FAMILY_PROVIDERS = {
+    't2.': 'aws', 't3.': 'aws', 'm5.': 'aws', 'c5.': 'aws',
+    'n1-': 'gcp', 'n2-': 'gcp', 'e2-': 'gcp',
+    'Standard_': 'azure', 'Basic_': 'azure'
+}
+
+# Fleets reuse a handful of instance types, so these inferences are memoized per type
+@lru_cache(maxsize=None)
+def _instance_type_provider(instance_type: str) -> str:
+    """Infer the cloud provider from an instance type name"""
+    family = INSTANCE_FAMILY_RE.match(instance_type)
+    if family:
+        return INSTANCE_FAMILY_PROVIDERS.get(family.group(), 'unknown')
+    return 'unknown'
+
+@lru_cache(maxsize=None)
+def _instance_type_server_type(instance_type: str) -> str:
+    """Infer the server type from an instance type name"""
+    if 'large' in instance_type or 'xlarge' in instance_type:
+        return 'high_performance'
+    elif 'small' in instance_type or 'micro' in instance_type:
+        return 'basic'
+    return 'standard'
+
+def _intern(value: Any) -> Any:
+    """Intern string classification values; they repeat across most hosts"""
+    return sys.intern(value) if type(value) is str else value
+
+def _has_non_str_keys(value: Any) -> bool:
+    """Whether any mapping nested in value has a key that is not a string"""
+    if isinstance(value, dict):
+        return any(type(k) is not str or _has_non_str_keys(v) for k, v in value.items())
+    if isinstance(value, list):
+        return any(_has_non_str_keys(v) for v in value)
+    return False
+
+def _canonical_key(value: Any) -> Optional[bytes]:
+    """Serialize value with sorted keys so equal structures compare equal; None if not serializable"""
+    # Non-string keys are rejected rather than stringified, which would make
+    # {1: 'x'} and {'1': 'x'} share a key
+    try:
+        if orjson is not None:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+        # json rejects circular structures first, so the key scan always terminates
+        data = json.dumps(value, sort_keys=True).encode()
+        return None if _has_non_str_keys(value) else data
+    except (TypeError, ValueError, RecursionError):
+        return None
+
+def _write_json_stream(inventory: Dict[str, Any], f: BinaryIO) -> None:
+    """Write inventory as indented JSON one group / one host's vars at a time.
+    
+    Produces the same bytes as orjson.dumps(inventory, option=OPT_INDENT_2 | OPT_NON_STR_KEYS)
+    without holding the serialized document in memory; requires orjson.
+    """
+    options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    
+    def dump(value: Any, depth: int) -> bytes:
+        return orjson.dumps(value, option=options).replace(b'\n', b'\n' + b'  ' * depth)
+    
+    def dump_key(key: Any) -> bytes:
+        # Let orjson render the key itself: None -> "null", True -> "true", ...
+        return orjson.dumps({key: None}, option=orjson.OPT_NON_STR_KEYS)[1:-len(b':null}')]
+    
+    if not inventory:
+        f.write(b'{}')
+        return
+    
+    f.write(b'{')
+    for i, (group_name, group_data) in enumerate(inventory.items()):
+        f.write(b',\n  ' if i else b'\n  ')
+        f.write(dump_key(group_name) + b': ')
+        
+        hostvars = group_data.get('hostvars') if group_name == '_meta' and len(group_data) == 1 else None
+        if isinstance(hostvars, dict) and hostvars:
+            f.write(b'{\n    "hostvars": {')
+            for j, (hostname, host_vars) in enumerate(hostvars.items()):
+                f.write(b',\n      ' if j else b'\n      ')
+                f.write(dump_key(hostname) + b': ')
+                f.write(dump(host_vars, 3))
+            f.write(b'\n    }\n  }')
+        else:
+            f.write(dump(group_data, 1))
+    f.write(b'\n}')
+
+@dataclass(slots=True)
+class HostInfo:
+    """Classification of a single host used for grouping"""
+    hostname: str
+    region: str
+    protocols: List[str]
+    capacity: int
+    provider: str
+    environment: str
+    server_type: str
+    zone: str
+    instance_type: str
+    tags: Dict[str, Any]
+    vars: Dict[str, Any]
+
 class InventoryOrganizer:
-    def __init__(self, inventory_path: str = None, config_path: str = None):
+    def __init__(self, inventory_path: Optional[str] = None, config_path: Optional[str] = None,
+                 use_cache: bool = True) -> None:
         self.inventory_path = inventory_path or 'inventories/production'
         self.config_path = config_path or 'inventories/organization-config.yml'
+        self.use_cache = use_cache
         self.config = self.load_config()
+        # Resolved once; consulted for every host during extraction
+        self.region_mapping = self.config['grouping_strategies']['by_region'].get('mapping', {})
+        
+    def _load_file(self, path: str, parse: Callable[[IO], Any], mode: str = 'r') -> Any:
+        """Parse a file, reusing a pickled copy stored next to it while the source is unchanged"""
+        if not self.use_cache:
+            with open(path, mode) as f:
+                return parse(f)
+        
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        cache_path = f"{path}.cache.pkl"
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, data = pickle.load(f)
+            if cached_key == key:
+                logger.debug(f"Using cached parse of {path}")
+                return data
+        except Exception as e:
+            # A truncated or foreign cache file is just a miss
+            logger.debug(f"Ignoring cache {cache_path}: {e}")
+        
+        with open(path, mode) as f:
+            data = parse(f)
+        
+        # --glob workers share the config cache; swap it in whole so none reads a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.debug(f"Could not write cache {cache_path}: {e}")
+        
+        return data
         
     def load_config(self) -> Dict[str, Any]:
         """Load organization configuration"""
@@ -81,24 +284,24 @@ class InventoryOrganizer:
         }
         
         if os.path.exists(self.config_path):
-            with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                # Merge with defaults
-                for key, value in default_config.items():
-                    if key not in config:
-                        config[key] = value
-                return config
+            config = self._load_file(self.config_path, lambda f: yaml.load(f, Loader=SafeLoader))
+            # Merge with defaults
+            for key, value in default_config.items():
+                if key not in config:
+                    config[key] = value
+            return config
         else:
             return default_config
     
     def load_inventory(self) -> Dict[str, Any]:
         """Load existing inventory"""
         if os.path.isfile(self.inventory_path):
-            with open(self.inventory_path, 'r') as f:
-                if self.inventory_path.endswith(('.yml', '.yaml')):
-                    return yaml.safe_load(f)
-                else:
-                    return json.load(f)
+            if self.inventory_path.endswith(('.yml', '.yaml')):
+                return self._load_file(self.inventory_path, lambda f: yaml.load(f, Loader=SafeLoader))
+            elif orjson is not None:
+                return self._load_file(self.inventory_path, lambda f: orjson.loads(f.read()), mode='rb')
+            else:
+                return self._load_file(self.inventory_path, json.load)
         else:
             # Create empty inventory structure
             return {
@@ -106,56 +309,59 @@ class InventoryOrganizer:
                 'all': {'children': []}
             }
     
-    def extract_hosts_info(self, inventory: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def extract_hosts_info(self, inventory: Dict[str, Any]) -> List[HostInfo]:
         """Extract host information for organization"""
-        hosts_info = []
-        
         if '_meta' not in inventory or 'hostvars' not in inventory['_meta']:
             logger.warning("No hostvars found in inventory")
-            return hosts_info
+            return []
         
         hostvars = inventory['_meta']['hostvars']
         
-        # Collect hosts from all groups
-        all_hosts = set()
+        # hostvars is the canonical host list; groups only add hosts that have no vars entry
+        host_entries = list(hostvars.items())
+        seen_without_vars = set()
         for group_name, group_data in inventory.items():
-            if group_name == '_meta':
+            if group_name == '_meta' or not isinstance(group_data, dict):
                 continue
-            if isinstance(group_data, dict) and 'hosts' in group_data:
-                all_hosts.update(group_data['hosts'])
+            for hostname in group_data.get('hosts', ()):
+                if hostname not in hostvars and hostname not in seen_without_vars:
+                    seen_without_vars.add(hostname)
+                    host_entries.append((hostname, {}))
+        
+        # Bind the extractors once so the per-host loop skips attribute lookups
+        extract_region = self.extract_region
+        extract_protocols = self.extract_protocols
+        extract_capacity = self.extract_capacity
+        extract_provider = self.extract_provider
+        extract_environment = self.extract_environment
+        extract_server_type = self.extract_server_type
         
         # Extract information for each host
-        for hostname in all_hosts:
-            host_vars = hostvars.get(hostname, {})
-            
-            host_info = {
-                'hostname': hostname,
-                'region': self.extract_region(host_vars),
-                'protocols': self.extract_protocols(host_vars),
-                'capacity': self.extract_capacity(host_vars),
-                'provider': self.extract_provider(host_vars),
-                'environment': self.extract_environment(host_vars),
-                'server_type': self.extract_server_type(host_vars),
-                'zone': host_vars.get('availability_zone', ''),
-                'instance_type': host_vars.get('instance_type', ''),
-                'tags': host_vars.get('cloud_tags', {}),
-                'vars': host_vars
-            }
-            
-            hosts_info.append(host_info)
-        
-        return hosts_info
+        return [
+            HostInfo(
+                hostname,
+                extract_region(host_vars),
+                extract_protocols(host_vars),
+                extract_capacity(host_vars),
+                extract_provider(host_vars),
+                extract_environment(host_vars),
+                extract_server_type(host_vars),
+                host_vars.get('availability_zone', ''),
+                host_vars.get('instance_type', ''),
+                host_vars.get('cloud_tags', {}),
+                host_vars
+            )
+            for hostname, host_vars in host_entries
+        ]
     
     def extract_region(self, host_vars: Dict[str, Any]) -> str:
         """Extract region information from host vars"""
         # Try multiple possible region fields
-        region_fields = ['server_region', 'region', 'aws_region', 'gcp_zone', 'azure_region']
-        
-        for field in region_fields:
-            if field in host_vars:
-                region = host_vars[field]
+        for field in REGION_FIELDS:
+            region = host_vars.get(field)
+            if region is not None:
                 # Map cloud regions to standard regions
-                return self.config['grouping_strategies']['by_region']['mapping'].get(region, region)
+                return _intern(self.region_mapping.get(region, region))
         
         return 'unknown'
     
@@ -164,9 +370,9 @@ class InventoryOrganizer:
         protocols = host_vars.get('server_protocols', [])
         
         if isinstance(protocols, str):
-            return [protocols]
+            return [_intern(protocols)]
         elif isinstance(protocols, list):
-            return protocols
+            return [_intern(protocol) for protocol in protocols]
         else:
             return ['wireguard']  # Default protocol
     
@@ -180,36 +386,28 @@ class InventoryOrganizer:
     
     def extract_provider(self, host_vars: Dict[str, Any]) -> str:
         """Extract cloud provider from host vars"""
-        provider_fields = ['cloud_provider', 'provider', 'aws_provider', 'gcp_provider']
-        
-        for field in provider_fields:
-            if field in host_vars:
-                return host_vars[field]
+        for field in PROVIDER_FIELDS:
+            provider = host_vars.get(field)
+            if provider is not None:
+                return _intern(provider)
         
         # Try to infer from instance type or other fields
-        instance_type = host_vars.get('instance_type', '')
-        if instance_type.startswith(('t2.', 't3.', 'm5.', 'c5.')):
-            return 'aws'
-        elif instance_type.startswith(('n1-', 'n2-', 'e2-')):
-            return 'gcp'
-        elif instance_type.startswith(('Standard_', 'Basic_')):
-            return 'azure'
-        
-        return 'unknown'
+        return _instance_type_provider(host_vars.get('instance_type', ''))
     
     def extract_environment(self, host_vars: Dict[str, Any]) -> str:
         """Extract environment from host vars or tags"""
         # Check direct environment field
-        if 'environment' in host_vars:
-            return host_vars['environment']
+        environment = host_vars.get('environment')
+        if environment is not None:
+            return _intern(environment)
         
         # Check cloud tags
         tags = host_vars.get('cloud_tags', {})
-        env_fields = ['Environment', 'environment', 'Env', 'env']
         
-        for field in env_fields:
-            if field in tags:
-                return tags[field].lower()
+        for field in ENVIRONMENT_TAG_FIELDS:
+            environment = tags.get(field)
+            if environment is not None:
+                return _intern(environment.lower())
         
         return 'production'  # Default environment
     
@@ -219,15 +417,11 @@ class InventoryOrganizer:
         
         # Infer from instance type if not explicitly set
         if server_type == 'standard':
-            instance_type = host_vars.get('instance_type', '')
-            if 'large' in instance_type or 'xlarge' in instance_type:
-                return 'high_performance'
-            elif 'small' in instance_type or 'micro' in instance_type:
-                return 'basic'
+            return _instance_type_server_type(host_vars.get('instance_type', ''))
         
-        return server_type
+        return _intern(server_type)
     
-    def create_organized_inventory(self, hosts_info: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def create_organized_inventory(self, hosts_info: List[HostInfo]) -> Dict[str, Any]:
         """Create organized inventory with proper grouping"""
         inventory = {
             '_meta': {'hostvars': {}},
@@ -239,233 +433,151 @@ class InventoryOrganizer:
         for group in base_groups:
             inventory[group] = {'hosts': [], 'children': []}
         
-        # Group hosts by various strategies
-        groups_created = set(base_groups)
+        # Snapshot grouping strategy settings once instead of per host
+        strategies = self.config['grouping_strategies']
+        region_cfg = strategies['by_region']
+        protocol_cfg = strategies['by_protocol']
+        capacity_cfg = strategies['by_capacity']
+        provider_cfg = strategies['by_provider']
+        environment_cfg = strategies['by_environment']
+        server_type_cfg = strategies['by_server_type']
+        
+        region_enabled = region_cfg['enabled']
+        protocol_enabled = protocol_cfg['enabled']
+        protocol_prefix = protocol_cfg.get('prefix', '')
+        protocol_suffix = protocol_cfg.get('suffix', '_servers')
+        capacity_enabled = capacity_cfg['enabled']
+        capacity_prefix = capacity_cfg.get('prefix', 'capacity_')
+        # Tiers are non-overlapping ranges, so the first tier whose max is >= capacity
+        # is the only candidate; keep them sorted by max for a bisect lookup
+        capacity_bounds: List[Tuple[int, int, str]] = sorted(
+            (tier_config['max'], tier_config['min'], f"{capacity_prefix}{tier_name}")
+            for tier_name, tier_config in capacity_cfg['tiers'].items()
+        ) if capacity_enabled else []
+        capacity_maxes: List[int] = [bounds[0] for bounds in capacity_bounds]
+        provider_enabled = provider_cfg['enabled']
+        provider_prefix = provider_cfg.get('prefix', '')
+        provider_suffix = provider_cfg.get('suffix', '_servers')
+        environment_enabled = environment_cfg['enabled']
+        environment_prefix = environment_cfg.get('prefix', 'env_')
+        server_type_enabled = server_type_cfg['enabled']
+        server_type_prefix = server_type_cfg.get('prefix', 'type_')
+        
+        # Group hosts by various strategies, in first-seen group order. Each group is an
+        # insertion-ordered dict used as a set, so a host lands in a group at most once
+        groups: DefaultDict[str, Dict[str, None]] = defaultdict(dict)
+        hostvars: Dict[str, Any] = inventory['_meta']['hostvars']
+        canonical_vars: Dict[bytes, Dict[str, Any]] = {}
+        
+        # Visiting hosts in name order leaves every group's host list sorted
+        if self.config['optimization']['sort_hosts']:
+            hosts_info = sorted(hosts_info, key=attrgetter('hostname'))
         
         for host_info in hosts_info:
-            hostname = host_info['hostname']
+            hostname = host_info.hostname
             
             # Add to base group
-            inventory['vpn_servers']['hosts'].append(hostname)
+            groups['vpn_servers'][hostname] = None
             
-            # Store host vars
-            inventory['_meta']['hostvars'][hostname] = host_info['vars']
+            # Store host vars; hosts with identical vars share one dict, which the
+            # YAML dumper then emits once as an anchor
+            host_vars = host_info.vars
+            if host_vars:
+                key = _canonical_key(host_vars)
+                if key is not None:
+                    host_vars = canonical_vars.setdefault(key, host_vars)
+            hostvars[hostname] = host_vars
             
-            # Apply grouping strategies
-            self.apply_regional_grouping(inventory, host_info, groups_created)
-            self.apply_protocol_grouping(inventory, host_info, groups_created)
-            self.apply_capacity_grouping(inventory, host_info, groups_created)
-            self.apply_provider_grouping(inventory, host_info, groups_created)
-            self.apply_environment_grouping(inventory, host_info, groups_created)
-            self.apply_server_type_grouping(inventory, host_info, groups_created)
-        
-        # Apply group variables
-        self.apply_group_variables(inventory)
-        
-        # Optimize inventory
-        self.optimize_inventory(inventory)
-        
-        return inventory
-    
-    def apply_regional_grouping(self, inventory: Dict[str, Any], host_info: Dict[str, Any], 
-                              groups_created: Set[str]) -> None:
-        """Apply regional grouping strategy"""
-        if not self.config['grouping_strategies']['by_region']['enabled']:
-            return
-        
-        region = host_info['region']
-        if region == 'unknown':
-            return
-        
-        group_name = region
-        
-        if group_name not in groups_created:
-            inventory[group_name] = {'hosts': [], 'vars': {}}
-            groups_created.add(group_name)
-        
-        inventory[group_name]['hosts'].append(host_info['hostname'])
-    
-    def apply_protocol_grouping(self, inventory: Dict[str, Any], host_info: Dict[str, Any],
-                               groups_created: Set[str]) -> None:
-        """Apply protocol-based grouping strategy"""
-        if not self.config['grouping_strategies']['by_protocol']['enabled']:
-            return
-        
-        config = self.config['grouping_strategies']['by_protocol']
-        
-        for protocol in host_info['protocols']:
-            group_name = f"{config.get('prefix', '')}{protocol}{config.get('suffix', '_servers')}"
+            if region_enabled:
+                region = host_info.region
+                if region != 'unknown':
+                    groups[region][hostname] = None
             
-            if group_name not in groups_created:
-                inventory[group_name] = {'hosts': [], 'vars': {}}
-                groups_created.add(group_name)
+            if protocol_enabled:
+                for protocol in host_info.protocols:
+                    groups[f"{protocol_prefix}{protocol}{protocol_suffix}"][hostname] = None
             
-            inventory[group_name]['hosts'].append(host_info['hostname'])
-    
-    def apply_capacity_grouping(self, inventory: Dict[str, Any], host_info: Dict[str, Any],
-                               groups_created: Set[str]) -> None:
-        """Apply capacity-based grouping strategy"""
-        if not self.config['grouping_strategies']['by_capacity']['enabled']:
-            return
-        
-        config = self.config['grouping_strategies']['by_capacity']
-        capacity = host_info['capacity']
-        
-        # Determine capacity tier
-        tier = 'unknown'
-        for tier_name, tier_config in config['tiers'].items():
-            if tier_config['min'] <= capacity <= tier_config['max']:
-                tier = tier_name
-                break
-        
-        if tier != 'unknown':
-            group_name = f"{config.get('prefix', 'capacity_')}{tier}"
+            if capacity_enabled:
+                capacity = host_info.capacity
+                idx = bisect_left(capacity_maxes, capacity)
+                if idx < len(capacity_bounds) and capacity >= capacity_bounds[idx][1]:
+                    groups[capacity_bounds[idx][2]][hostname] = None
             
-            if group_name not in groups_created:
-                inventory[group_name] = {'hosts': [], 'vars': {}}
-                groups_created.add(group_name)
+            if provider_enabled:
+                provider = host_info.provider
+                if provider != 'unknown':
+                    groups[f"{provider_prefix}{provider}{provider_suffix}"][hostname] = None
             
-            inventory[group_name]['hosts'].append(host_info['hostname'])
-    
-    def apply_provider_grouping(self, inventory: Dict[str, Any], host_info: Dict[str, Any],
-                               groups_created: Set[str]) -> None:
-        """Apply cloud provider grouping strategy"""
-        if not self.config['grouping_strategies']['by_provider']['enabled']:
-            return
-        
-        provider = host_info['provider']
-        if provider == 'unknown':
-            return
-        
-        config = self.config['grouping_strategies']['by_provider']
-        group_name = f"{config.get('prefix', '')}{provider}{config.get('suffix', '_servers')}"
-        
-        if group_name not in groups_created:
-            inventory[group_name] = {'hosts': [], 'vars': {}}
-            groups_created.add(group_name)
-        
-        inventory[group_name]['hosts'].append(host_info['hostname'])
-    
-    def apply_environment_grouping(self, inventory: Dict[str, Any], host_info: Dict[str, Any],
-                                  groups_created: Set[str]) -> None:
-        """Apply environment-based grouping strategy"""
-        if not self.config['grouping_strategies']['by_environment']['enabled']:
-            return
-        
-        environment = host_info['environment']
-        config = self.config['grouping_strategies']['by_environment']
-        group_name = f"{config.get('prefix', 'env_')}{environment}"
-        
-        if group_name not in groups_created:
-            inventory[group_name] = {'hosts': [], 'vars': {}}
-            groups_created.add(group_name)
+            if environment_enabled:
+                groups[f"{environment_prefix}{host_info.environment}"][hostname] = None
+            
+            if server_type_enabled:
+                groups[f"{server_type_prefix}{host_info.server_type}"][hostname] = None
         
-        inventory[group_name]['hosts'].append(host_info['hostname'])
-    
-    def apply_server_type_grouping(self, inventory: Dict[str, Any], host_info: Dict[str, Any],
-                                  groups_created: Set[str]) -> None:
-        """Apply server type grouping strategy"""
-        if not self.config['grouping_strategies']['by_server_type']['enabled']:
-            return
+        for group_name, hosts in groups.items():
+            if group_name in inventory:
+                inventory[group_name]['hosts'] = list(hosts)
+            else:
+                inventory[group_name] = {'hosts': list(hosts), 'vars': {}}
         
-        server_type = host_info['server_type']
-        config = self.config['grouping_strategies']['by_server_type']
-        group_name = f"{config.get('prefix', 'type_')}{server_type}"
+        # Apply group variables
+        self.apply_group_variables(inventory)
         
-        if group_name not in groups_created:
-            inventory[group_name] = {'hosts': [], 'vars': {}}
-            groups_created.add(group_name)
+        # Optimize inventory
+        self.optimize_inventory(inventory)
         
-        inventory[group_name]['hosts'].append(host_info['hostname'])
+        return inventory
     
     def apply_group_variables(self, inventory: Dict[str, Any]) -> None:
         """Apply appropriate variables to groups"""
         
         # Regional variables
         if self.config['group_vars']['apply_regional_vars']:
-            regional_vars = {
-                'europe': {
-                    'ntp_servers': ['0.europe.pool.ntp.org', '1.europe.pool.ntp.org'],
-                    'dns_servers': ['1.1.1.1', '8.8.8.8'],
-                    'timezone': 'Europe/London'
-                },
-                'north_america': {
-                    'ntp_servers': ['0.north-america.pool.ntp.org', '1.north-america.pool.ntp.org'],
-                    'dns_servers': ['1.1.1.1', '8.8.8.8'],
-                    'timezone': 'America/New_York'
-                },
-                'asia_pacific': {
-                    'ntp_servers': ['0.asia.pool.ntp.org', '1.asia.pool.ntp.org'],
-                    'dns_servers': ['1.1.1.1', '8.8.8.8'],
-                    'timezone': 'Asia/Singapore'
-                }
-            }
-            
-            for region, vars_dict in regional_vars.items():
+            for region, vars_dict in REGIONAL_VARS.items():
                 if region in inventory:
-                    inventory[region]['vars'].update(vars_dict)
+                    inventory[region].setdefault('vars', {}).update(vars_dict)
         
         # Protocol variables
         if self.config['group_vars']['apply_protocol_vars']:
-            protocol_vars = {
-                'wireguard_servers': {
-                    'wireguard_port': 51820,
-                    'wireguard_dashboard_port': 10086,
-                    'wireguard_interface': 'wg0'
-                },
-                'openvpn_servers': {
-                    'openvpn_port': 1194,
-                    'openvpn_protocol': 'udp',
-                    'openvpn_cipher': 'AES-256-GCM'
-                },
-                'amneziawg_servers': {
-                    'amneziawg_port': 51821,
-                    'amneziawg_interface': 'awg0'
-                }
-            }
-            
-            for group, vars_dict in protocol_vars.items():
+            for group, vars_dict in PROTOCOL_VARS.items():
                 if group in inventory:
-                    inventory[group]['vars'].update(vars_dict)
+                    inventory[group].setdefault('vars', {}).update(vars_dict)
     
     def optimize_inventory(self, inventory: Dict[str, Any]) -> None:
         """Optimize inventory structure"""
         
-        # Remove empty groups
+        # Remove empty groups in a single pass over a snapshot of the group names
         if self.config['optimization']['remove_empty_groups']:
-            empty_groups = []
-            for group_name, group_data in inventory.items():
+            for group_name in list(inventory):
                 if group_name == '_meta':
                     continue
-                if isinstance(group_data, dict) and 'hosts' in group_data:
-                    if not group_data['hosts']:
-                        empty_groups.append(group_name)
-            
-            for group in empty_groups:
-                del inventory[group]
-                logger.info(f"Removed empty group: {group}")
+                group_data = inventory[group_name]
+                if isinstance(group_data, dict) and 'hosts' in group_data and not group_data['hosts']:
+                    del inventory[group_name]
+                    logger.info(f"Removed empty group: {group_name}")
         
-        # Sort hosts in groups
-        if self.config['optimization']['sort_hosts']:
-            for group_name, group_data in inventory.items():
-                if group_name == '_meta':
-                    continue
-                if isinstance(group_data, dict) and 'hosts' in group_data:
-                    group_data['hosts'].sort()
+        # Host lists are already sorted when sort_hosts is set: create_organized_inventory
+        # appends hosts in name order
     
     def save_inventory(self, inventory: Dict[str, Any], output_path: str) -> None:
         """Save organized inventory to file"""
         
         if output_path.endswith(('.yml', '.yaml')):
-            with open(output_path, 'w') as f:
-                yaml.dump(inventory, f, default_flow_style=False, sort_keys=False)
+            # Leaf collections (host lists, scalar-only vars) are emitted inline;
+            # a huge width disables the dumper's line-wrapping pass
+            with open(output_path, 'w', encoding='utf-8') as f:
+                yaml.dump(inventory, f, Dumper=SafeDumper, default_flow_style=None, sort_keys=False,
+                          width=1_000_000, allow_unicode=True)
+        elif orjson is not None:
+            with open(output_path, 'wb') as f:
+                _write_json_stream(inventory, f)
         else:
             with open(output_path, 'w') as f:
                 json.dump(inventory, f, indent=2, sort_keys=False)
         
         logger.info(f"Organized inventory saved to: {output_path}")
     
-    def organize_inventory(self, output_path: str = None) -> Dict[str, Any]:
+    def organize_inventory(self, output_path: Optional[str] = None) -> Dict[str, Any]:
         """Main method to organize inventory"""
         
         logger.info(f"Loading inventory from: {self.inventory_path}")
@@ -490,13 +602,30 @@ class InventoryOrganizer:
         
         return organized_inventory
 
-def main():
+def default_output_path(inventory_path: str, output_format: str) -> str:
+    """Derive the organized inventory path for an input inventory"""
+    extension = 'yml' if output_format == 'yaml' else 'json'
+    return f"{inventory_path}-organized.{extension}"
+
+def organize_file(inventory_path: str, config_path: Optional[str] = None, output_format: str = 'yaml',
+                  use_cache: bool = True) -> str:
+    """Organize one inventory file to its default output path (process pool worker)"""
+    output_path = default_output_path(inventory_path, output_format)
+    organizer = InventoryOrganizer(inventory_path, config_path, use_cache=use_cache)
+    organizer.organize_inventory(output_path)
+    return output_path
+
+def main() -> None:
     parser = argparse.ArgumentParser(description='VPN Infrastructure Inventory Organizer')
     parser.add_argument('--inventory', '-i', help='Path to input inventory file')
+    parser.add_argument('--glob', '-g',
+                       help='Organize every inventory file matching this pattern in parallel')
     parser.add_argument('--config', '-c', help='Path to organization config file')
     parser.add_argument('--output', '-o', help='Path to output organized inventory')
     parser.add_argument('--format', choices=['json', 'yaml'], default='yaml',
                        help='Output format')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always re-parse inputs instead of using the *.cache.pkl parse cache')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     
     args = parser.parse_args()
@@ -504,16 +633,29 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.glob:
+        if args.inventory or args.output:
+            parser.error("--glob cannot be combined with --inventory or --output")
+        
+        # Skip parse caches and outputs of earlier runs that the pattern may also match
+        inventory_files = sorted(
+            p for p in glob.glob(args.glob)
+            if not p.endswith('.cache.pkl') and '-organized.' not in os.path.basename(p)
+        )
+        if not inventory_files:
+            parser.error(f"--glob matched no inventory files: {args.glob}")
+        
+        worker = partial(organize_file, config_path=args.config, output_format=args.format,
+                         use_cache=not args.no_cache)
+        with multiprocessing.Pool(min(len(inventory_files), os.cpu_count() or 1)) as pool:
+            for output_path in pool.map(worker, inventory_files):
+                print(f"Inventory organization completed. Output saved to: {output_path}")
+        return
+    
     # Determine output path
-    output_path = args.output
-    if not output_path:
-        base_path = args.inventory or 'inventories/production'
-        if args.format == 'yaml':
-            output_path = f"{base_path}-organized.yml"
-        else:
-            output_path = f"{base_path}-organized.json"
+    output_path = args.output or default_output_path(args.inventory or 'inventories/production', args.format)
     
-    organizer = InventoryOrganizer(args.inventory, args.config)
+    organizer = InventoryOrganizer(args.inventory, args.config, use_cache=not args.no_cache)
     organized_inventory = organizer.organize_inventory(output_path)
     
     print(f"Inventory organization completed. Output saved to: {output_path}")
@@ -4,28 +4,232 @@ Configuration Validation Script for VPN Infrastructure
 Validates Ansible configuration files, templates, and variable consistency
 """
 
+from __future__ import annotations
+
 import os
 import sys
-import yaml
 import json
 import argparse
-import ipaddress
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Set, TYPE_CHECKING
 import re
-from jinja2 import Environment, FileSystemLoader, TemplateError
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# yaml, jinja2 and ipaddress are imported where they are used so that
+# --help and partial runs (--only) do not pay for them
+if TYPE_CHECKING:
+    import yaml
+    from jinja2 import Environment
+
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _safe_loader() -> type:
+    """PyYAML's safe loader class, using the libyaml C bindings when available"""
+    try:
+        from yaml import CSafeLoader as loader
+    except ImportError:
+        from yaml import SafeLoader as loader
+    return loader
+
+# Directories never descended into when scanning the tree
+SKIP_DIRS = {'node_modules', '__pycache__'}
+
+# Which files validate_yaml_files checks:
+#   inventories/** and playbooks/**          - .yml and .yaml
+#   roles/**/{defaults,vars,meta}/           - .yml
+YAML_TOP_DIRS = {'inventories', 'playbooks'}
+ROLE_YAML_DIRS = {'defaults', 'vars', 'meta'}
+SCAN_TOP_DIRS = YAML_TOP_DIRS | {'roles'}
+
+def _should_check_yaml(parts: Tuple[str, ...]) -> bool:
+    """Classify a path (relative parts, file name last) for YAML syntax checking"""
+    name = parts[-1]
+    if parts[0] in YAML_TOP_DIRS:
+        return len(parts) > 1 and name.endswith(('.yml', '.yaml'))
+    return (parts[0] == 'roles' and len(parts) >= 3
+            and parts[-2] in ROLE_YAML_DIRS and name.endswith('.yml'))
+
+# Worker threads for per-file parsing (libyaml and file I/O release the GIL)
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+# Files an inventory checkout must contain, relative to the base path
+REQUIRED_FILES = [
+    "inventories/production",
+    "inventories/group_vars/all.yml",
+    "inventories/group_vars/vpn_servers.yml"
+]
+
+# Groups every inventory must define as INI section headers
+REQUIRED_GROUPS = ['vpn_servers', 'wireguard_servers', 'openvpn_servers']
+
+# Common Jinja2 mistakes, used to explain a syntax error the parser reported on the same line.
+# The parser alone decides whether a template is valid: {# {{ in a comment #} and
+# {{ "a \" {{ b" }} both parse. JINJA_TAG_BODY matches an opening delimiter plus tag
+# content, skipping quoted strings (with backslash escapes) so {{ '{{' }} is not flagged.
+JINJA_STRING = rb'\'(?:[^\'\\]|\\.)*\'|"(?:[^"\\]|\\.)*"'
+JINJA_TAG_BODY = (rb'(?:\{\{(?:[^}\'"]|' + JINJA_STRING + rb')*?'
+                  rb'|\{%(?:[^%\'"]|' + JINJA_STRING + rb')*?)')
+JINJA_BAD_PATTERNS = [
+    (re.compile(JINJA_TAG_BODY + rb'\{\{'), "nested delimiters"),
+    (re.compile(JINJA_TAG_BODY + rb'->'), "invalid property access '->' (use '.')"),
+]
+JINJA_COMMENT_RE = re.compile(rb'\{#.*?#\}', re.DOTALL)
+JINJA_RAW_RE = re.compile(rb'\{%-?\s*raw\b')
+
+IPV4_RE = re.compile(r'([0-9]{1,3})\.([0-9]{1,3})\.([0-9]{1,3})\.([0-9]{1,3})')
+
+def _is_ip_address(value: Any) -> bool:
+    """Check an IP address, using a regex fast path for dotted-quad IPv4"""
+    match = IPV4_RE.fullmatch(value) if isinstance(value, str) else None
+    if match:
+        # Same rules as ipaddress: each octet <= 255 with no leading zeros
+        return all(int(octet) <= 255 and (octet == '0' or octet[0] != '0') for octet in match.groups())
+    import ipaddress
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+# Marks a value the event scan cannot build on its own
+_NEEDS_FULL_PARSE = object()
+
+def _skip_yaml_node(loader: yaml.SafeLoader) -> None:
+    """Consume the events of one node, however deeply nested"""
+    import yaml
+    depth = 0
+    while True:
+        event = loader.get_event()
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return
+
+def _construct_yaml_scalar(loader: yaml.SafeLoader, event: yaml.ScalarEvent) -> Any:
+    """Build a scalar value with the loader's implicit type resolution"""
+    import yaml
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+    node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+    return loader.construct_object(node)
+
+def _construct_flat_yaml_value(loader: yaml.SafeLoader) -> Any:
+    """Build a scalar or a flat list of scalars; anything else needs a full parse"""
+    import yaml
+    event = loader.get_event()
+    if isinstance(event, yaml.ScalarEvent):
+        return _construct_yaml_scalar(loader, event)
+    if isinstance(event, yaml.SequenceStartEvent):
+        items = []
+        while not loader.check_event(yaml.SequenceEndEvent):
+            item = loader.get_event()
+            if not isinstance(item, yaml.ScalarEvent):
+                return _NEEDS_FULL_PARSE
+            items.append(_construct_yaml_scalar(loader, item))
+        loader.get_event()  # SequenceEndEvent
+        return items
+    return _NEEDS_FULL_PARSE
+
+def _scan_yaml_top_keys(stream: Any, keys: set) -> Optional[Dict[str, Any]]:
+    """Pick the given top-level keys out of a YAML mapping from its event stream.
+    
+    Returns None when the document needs a full parse: a non-mapping root,
+    merge keys, complex keys, a wanted value that is an alias or nested,
+    or more than one document in the stream.
+    """
+    import yaml
+    loader = _safe_loader()(stream)
+    try:
+        loader.get_event()  # StreamStartEvent
+        if loader.check_event(yaml.StreamEndEvent):
+            return {}
+        loader.get_event()  # DocumentStartEvent
+        if not loader.check_event(yaml.MappingStartEvent):
+            return None
+        loader.get_event()
+        
+        found = {}
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = loader.get_event()
+            if not isinstance(key, yaml.ScalarEvent) or key.value == '<<':
+                return None
+            if key.value not in keys:
+                _skip_yaml_node(loader)
+                continue
+            
+            value = _construct_flat_yaml_value(loader)
+            if value is _NEEDS_FULL_PARSE:
+                return None
+            found[key.value] = value
+        loader.get_event()  # MappingEndEvent
+        loader.get_event()  # DocumentEndEvent
+        
+        # safe_load rejects a stream with more than one document
+        if not loader.check_event(yaml.StreamEndEvent):
+            return None
+        return found
+    finally:
+        loader.dispose()
+
+def _explain_template_error(data: bytes, error: Any) -> str:
+    """Message for a Jinja2 syntax error, naming a common mistake found on the same line"""
+    # raw blocks may legitimately contain anything
+    if not JINJA_RAW_RE.search(data):
+        # Blank out comments, keeping their newlines so line numbers still match
+        code = JINJA_COMMENT_RE.sub(lambda m: b'\n' * m.group().count(b'\n'), data)
+        for pattern, problem in JINJA_BAD_PATTERNS:
+            for match in pattern.finditer(code):
+                if code.count(b'\n', 0, match.end()) + 1 == error.lineno:
+                    return problem
+    return error.message
+
 class ConfigurationValidator:
     """Validates VPN infrastructure configuration files"""
     
+    # Validation stages in run order, selectable with --only
+    STAGES = {
+        'yaml': 'validate_yaml_files',
+        'inventory': 'validate_inventory_structure',
+        'variables': 'validate_variable_consistency',
+        'network': 'validate_network_configs',
+        'templates': 'validate_template_syntax',
+        'roles': 'validate_role_dependencies',
+        'security': 'validate_security_configs'
+    }
+    
+    # Declarative rules per group_vars file:
+    #   required - variables the group must define
+    #   ip_lists - variables holding lists of IP addresses
+    #   ports    - variable -> (min, max) allowed port range
+    _GROUP_SCHEMAS = {
+        'all': {
+            'required': ('ansible_user', 'ssh_port', 'timezone'),
+        },
+        'vpn_servers': {
+            'required': ('max_concurrent_connections', 'dns_servers'),
+            'ip_lists': ('dns_servers',),
+            'ports': {
+                'wireguard_port': (1024, 65535),
+                'openvpn_port_udp': (1024, 65535),
+                'openvpn_port_tcp': (1024, 65535),
+                'coredns_port': (1, 65535),
+                'node_exporter_port': (1024, 65535),
+            },
+        },
+        'wireguard_servers': {
+            'required': ('wireguard_port',),
+        },
+        'openvpn_servers': {
+            'required': ('openvpn_port_udp', 'openvpn_port_tcp'),
+        },
+    }
+    
     def __init__(self, base_path: str = "."):
         self.base_path = Path(base_path)
         self.errors = []
@@ -33,31 +237,145 @@ class ConfigurationValidator:
         self.inventory_path = self.base_path / "inventories"
         self.roles_path = self.base_path / "roles"
         self.playbooks_path = self.base_path / "playbooks"
+        self._file_index = None
+        self._yaml_cache: Dict[Path, Tuple[int, int, Any]] = {}
+        self._broken_files: Set[Path] = set()
+        self._jinja_env = None
+        self._role_names = None
+        self._dir_names: Dict[Path, frozenset] = {}
+        
+    @staticmethod
+    def _parse_yaml(path: Path) -> Tuple[Optional[Tuple[int, int]], Any, Optional[Exception]]:
+        """Stat and parse one YAML file without touching shared state (safe in worker threads)"""
+        import yaml
+        key = None
+        try:
+            st = path.stat()
+            key = (st.st_mtime_ns, st.st_size)
+            # libyaml decodes the raw bytes itself
+            with open(path, 'rb') as f:
+                return key, yaml.load(f, Loader=_safe_loader()), None
+        except Exception as e:
+            return key, None, e
+    
+    def _record_yaml(self, path: Path, result: Tuple[Optional[Tuple[int, int]], Any, Optional[Exception]]) -> Any:
+        """Cache a _parse_yaml result, reporting a parse error once and caching it as None"""
+        import yaml
+        key, data, error = result
+        if isinstance(error, yaml.YAMLError):
+            self.errors.append(f"Invalid YAML in {path}: {error}")
+            self._broken_files.add(path)
+        elif error is not None:
+            raise error
+        
+        self._yaml_cache[path] = (*key, data)
+        return data
+    
+    def _load_yaml(self, path: Path) -> Any:
+        """Parse a YAML file once per run; parse errors are recorded once and cached as None.
+        
+        Callers check _broken_files afterwards rather than validating the None.
+        """
+        if path in self._broken_files:
+            return None
+        st = path.stat()
+        cached = self._yaml_cache.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        return self._record_yaml(path, self._parse_yaml(path))
+    
+    def _yaml_top_keys(self, path: Path, keys: Any) -> Dict[str, Any]:
+        """Read only some top-level keys of a YAML mapping, streaming events unless already parsed"""
+        import yaml
+        keys = set(keys)
+        if path in self._broken_files:
+            return {}
+        st = path.stat()
+        cached = self._yaml_cache.get(path)
+        if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+            try:
+                with open(path, 'rb') as f:
+                    found = _scan_yaml_top_keys(f, keys)
+                if found is not None:
+                    return found
+            except yaml.YAMLError:
+                # _load_yaml below reports it
+                pass
+        
+        data = self._load_yaml(path)
+        return {k: data[k] for k in keys if k in data} if isinstance(data, dict) else {}
+    
+    def _scan_files(self) -> Tuple[List[Path], List[Path]]:
+        """Walk the tree once and classify files into (YAML files, Jinja2 templates)"""
+        if self._file_index is not None:
+            return self._file_index
         
-    def validate_all(self) -> bool:
-        """Run all validation checks"""
-        logger.info("Starting comprehensive configuration validation...")
-        
-        # Validate YAML syntax
-        self.validate_yaml_files()
-        
-        # Validate inventory structure
-        self.validate_inventory_structure()
-        
-        # Validate variable consistency
-        self.validate_variable_consistency()
-        
-        # Validate network configurations
-        self.validate_network_configs()
-        
-        # Validate template syntax
-        self.validate_template_syntax()
+        yaml_files = []
+        template_files = []
         
-        # Validate role dependencies
-        self.validate_role_dependencies()
+        for dirpath, dirnames, filenames in os.walk(self.base_path):
+            rel_parts = Path(dirpath).relative_to(self.base_path).parts
+            
+            # Prune hidden and vendored directories; sort for a stable report order
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS)
+            if not rel_parts:
+                dirnames[:] = [d for d in dirnames if d in SCAN_TOP_DIRS]
+                continue
+            
+            # Templates live under roles/** and inventories/templates/**
+            check_templates = rel_parts[0] == 'roles' or rel_parts[:2] == ('inventories', 'templates')
+            
+            for name in sorted(filenames):
+                if _should_check_yaml(rel_parts + (name,)):
+                    yaml_files.append(Path(dirpath, name))
+                elif check_templates and name.endswith('.j2'):
+                    template_files.append(Path(dirpath, name))
+        
+        self._file_index = (yaml_files, template_files)
+        return self._file_index
+    
+    @property
+    def jinja_env(self) -> Environment:
+        """Shared Jinja2 environment, built on first use"""
+        if self._jinja_env is None:
+            from jinja2 import Environment, FileSystemLoader
+            self._jinja_env = Environment(loader=FileSystemLoader(str(self.base_path)),
+                                          autoescape=False, cache_size=-1)
+        return self._jinja_env
+    
+    def _names_in(self, directory: Path) -> frozenset:
+        """Entry names of a directory, listed once per run (empty if it cannot be listed)"""
+        names = self._dir_names.get(directory)
+        if names is None:
+            try:
+                names = frozenset(os.listdir(directory))
+            except OSError:
+                names = frozenset()
+            self._dir_names[directory] = names
+        return names
+    
+    def _exists(self, path: Path) -> bool:
+        """exists() answered from the cached listing of the parent directory"""
+        return path.name in self._names_in(path.parent)
+    
+    @property
+    def role_names(self) -> set:
+        """Names of the role directories, from a single scandir of roles/"""
+        if self._role_names is None:
+            try:
+                with os.scandir(self.roles_path) as entries:
+                    self._role_names = {e.name for e in entries if e.is_dir()}
+            except (FileNotFoundError, NotADirectoryError):
+                self._role_names = set()
+        return self._role_names
+    
+    def validate_all(self, only: Optional[List[str]] = None) -> bool:
+        """Run all validation checks, or just the named stages"""
+        logger.info("Starting comprehensive configuration validation...")
         
-        # Validate security configurations
-        self.validate_security_configs()
+        for stage, method in self.STAGES.items():
+            if only is None or stage in only:
+                getattr(self, method)()
         
         # Print results
         self.print_results()
@@ -68,54 +386,43 @@ class ConfigurationValidator:
         """Validate YAML syntax in all configuration files"""
         logger.info("Validating YAML syntax...")
         
-        yaml_patterns = [
-            "inventories/**/*.yml",
-            "inventories/**/*.yaml", 
-            "playbooks/**/*.yml",
-            "playbooks/**/*.yaml",
-            "roles/**/defaults/*.yml",
-            "roles/**/vars/*.yml",
-            "roles/**/meta/*.yml"
-        ]
-        
-        for pattern in yaml_patterns:
-            for yaml_file in self.base_path.glob(pattern):
-                try:
-                    with open(yaml_file, 'r') as f:
-                        yaml.safe_load(f)
+        yaml_files, _ = self._scan_files()
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = list(executor.map(self._parse_yaml, yaml_files))
+        
+        # Results are recorded on the main thread so errors need no locking
+        for yaml_file, result in zip(yaml_files, results):
+            try:
+                if self._record_yaml(yaml_file, result) is not None:
                     logger.debug(f"✓ Valid YAML: {yaml_file}")
-                except yaml.YAMLError as e:
-                    self.errors.append(f"Invalid YAML in {yaml_file}: {e}")
-                except Exception as e:
-                    self.errors.append(f"Error reading {yaml_file}: {e}")
+            except Exception as e:
+                self.errors.append(f"Error reading {yaml_file}: {e}")
     
     def validate_inventory_structure(self):
         """Validate inventory structure and required files"""
         logger.info("Validating inventory structure...")
         
-        required_files = [
-            "inventories/production",
-            "inventories/group_vars/all.yml",
-            "inventories/group_vars/vpn_servers.yml"
-        ]
-        
-        for required_file in required_files:
-            file_path = self.base_path / required_file
-            if not file_path.exists():
+        for required_file in REQUIRED_FILES:
+            if not self._exists(self.base_path / required_file):
                 self.errors.append(f"Missing required file: {required_file}")
         
         # Validate inventory file format
         inventory_file = self.base_path / "inventories/production"
-        if inventory_file.exists():
+        if self._exists(inventory_file):
             try:
-                with open(inventory_file, 'r') as f:
-                    content = f.read()
-                    
-                # Check for required groups
-                required_groups = ['vpn_servers', 'wireguard_servers', 'openvpn_servers']
-                for group in required_groups:
-                    if f"[{group}]" not in content:
-                        self.warnings.append(f"Missing inventory group: {group}")
+                # Check for required groups, stopping once every header has been seen
+                needed = {f"[{group}]".encode(): group for group in REQUIRED_GROUPS}
+                with open(inventory_file, 'rb') as f:
+                    for line in f:
+                        line = line.lstrip()
+                        if line.startswith(b'['):
+                            needed.pop(line[:line.find(b']') + 1], None)
+                            if not needed:
+                                break
+                
+                for group in needed.values():
+                    self.warnings.append(f"Missing inventory group: {group}")
                         
             except Exception as e:
                 self.errors.append(f"Error reading inventory file: {e}")
@@ -124,114 +431,114 @@ class ConfigurationValidator:
         """Validate variable consistency across group_vars and host_vars"""
         logger.info("Validating variable consistency...")
         
-        # Load all group variables
-        group_vars = {}
         group_vars_path = self.inventory_path / "group_vars"
         
-        if group_vars_path.exists():
-            for var_file in group_vars_path.glob("*.yml"):
-                try:
-                    with open(var_file, 'r') as f:
-                        vars_data = yaml.safe_load(f) or {}
-                        group_vars[var_file.stem] = vars_data
-                except Exception as e:
-                    self.errors.append(f"Error loading group vars {var_file}: {e}")
-        
-        # Validate required variables
-        required_vars = {
-            'all': ['ansible_user', 'ssh_port', 'timezone'],
-            'vpn_servers': ['max_concurrent_connections', 'dns_servers'],
-            'wireguard_servers': ['wireguard_port'],
-            'openvpn_servers': ['openvpn_port_udp', 'openvpn_port_tcp']
-        }
-        
-        for group, vars_list in required_vars.items():
-            if group in group_vars:
-                for var in vars_list:
-                    if var not in group_vars[group]:
-                        self.warnings.append(f"Missing variable '{var}' in group '{group}'")
+        # Only groups with a schema are checked, so only their files are loaded
+        for group, schema in self._GROUP_SCHEMAS.items():
+            var_file = group_vars_path / f"{group}.yml"
+            vars_list = schema.get('required', ())
+            try:
+                group_vars = self._yaml_top_keys(var_file, vars_list)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                self.errors.append(f"Error loading group vars {var_file}: {e}")
+                continue
+            # Unparseable files are reported once, by the loader
+            if var_file in self._broken_files:
+                continue
+            
+            # Validate required variables
+            missing = set(vars_list).difference(group_vars)
+            # Keep the declared order in the report
+            for var in vars_list:
+                if var in missing:
+                    self.warnings.append(f"Missing variable '{var}' in group '{group}'")
     
     def validate_network_configs(self):
         """Validate network configuration consistency"""
         logger.info("Validating network configurations...")
         
+        schema = self._GROUP_SCHEMAS['vpn_servers']
+        
         # Load network configurations
+        vpn_file = self.inventory_path / "group_vars/vpn_servers.yml"
         try:
-            with open(self.inventory_path / "group_vars/vpn_servers.yml", 'r') as f:
-                vpn_config = yaml.safe_load(f) or {}
+            vpn_config = self._yaml_top_keys(vpn_file, [*schema['ip_lists'], *schema['ports']])
         except:
             return
+        if vpn_file in self._broken_files:
+            return
         
         # Validate DNS servers
-        dns_servers = vpn_config.get('dns_servers', [])
-        for dns_server in dns_servers:
-            try:
-                ipaddress.ip_address(dns_server)
-            except ValueError:
-                self.errors.append(f"Invalid DNS server IP: {dns_server}")
+        for ip_var in schema['ip_lists']:
+            for dns_server in vpn_config.get(ip_var, []):
+                if not _is_ip_address(dns_server):
+                    self.errors.append(f"Invalid DNS server IP: {dns_server}")
         
         # Validate port ranges
-        port_configs = [
-            ('wireguard_port', 1024, 65535),
-            ('openvpn_port_udp', 1024, 65535),
-            ('openvpn_port_tcp', 1024, 65535),
-            ('coredns_port', 1, 65535),
-            ('node_exporter_port', 1024, 65535)
-        ]
-        
-        for port_var, min_port, max_port in port_configs:
+        # Exact type check: skips the isinstance MRO walk and rejects booleans
+        for port_var, (min_port, max_port) in schema['ports'].items():
             if port_var in vpn_config:
                 port = vpn_config[port_var]
-                if not isinstance(port, int) or port < min_port or port > max_port:
+                if type(port) is not int or not min_port <= port <= max_port:
                     self.errors.append(f"Invalid port {port_var}: {port} (must be {min_port}-{max_port})")
     
     def validate_template_syntax(self):
         """Validate Jinja2 template syntax"""
         logger.info("Validating template syntax...")
         
-        template_paths = [
-            self.inventory_path / "templates",
-            self.roles_path
-        ]
+        _, template_files = self._scan_files()
         
-        for template_path in template_paths:
-            if not template_path.exists():
-                continue
-                
-            for template_file in template_path.rglob("*.j2"):
-                try:
-                    # Load template directory
-                    template_dir = template_file.parent
-                    env = Environment(loader=FileSystemLoader(str(template_dir)))
-                    
-                    # Parse template
-                    template = env.get_template(template_file.name)
-                    
-                    # Basic syntax validation (without rendering)
-                    template.environment.parse(template.source)
-                    logger.debug(f"✓ Valid template: {template_file}")
-                    
-                except TemplateError as e:
-                    self.errors.append(f"Template syntax error in {template_file}: {e}")
-                except Exception as e:
-                    self.errors.append(f"Error validating template {template_file}: {e}")
+        env = self.jinja_env
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = list(executor.map(lambda t: self._check_template(env, t), template_files))
+        
+        parsed = 0
+        for template_file, (was_parsed, error) in zip(template_files, results):
+            parsed += was_parsed
+            if error:
+                self.errors.append(error)
+            else:
+                logger.debug(f"✓ Valid template: {template_file}")
+        
+        logger.debug(f"Parsed {parsed} templates, skipped {len(template_files) - parsed} without Jinja2 markup")
+    
+    @staticmethod
+    def _check_template(env: Environment, template_file: Path) -> Tuple[bool, Optional[str]]:
+        """Parse one template, returning (parsed, error message or None if it is valid)"""
+        from jinja2 import TemplateError, TemplateSyntaxError
+        try:
+            data = template_file.read_bytes()
+            # Plain text without any Jinja2 delimiter cannot have a syntax error
+            if b'{{' not in data and b'{%' not in data and b'{#' not in data:
+                return False, None
+            
+            # Syntax validation only: parse the source without compiling or rendering
+            env.parse(data.decode('utf-8', errors='replace'), name=str(template_file), filename=str(template_file))
+            return True, None
+            
+        except TemplateSyntaxError as e:
+            return True, f"Template syntax error in {template_file}:{e.lineno}: {_explain_template_error(data, e)}"
+        except TemplateError as e:
+            return True, f"Template syntax error in {template_file}: {e}"
+        except Exception as e:
+            return True, f"Error validating template {template_file}: {e}"
     
     def validate_role_dependencies(self):
         """Validate role dependencies and meta information"""
         logger.info("Validating role dependencies...")
         
-        if not self.roles_path.exists():
-            return
+        role_names = self.role_names
         
-        for role_dir in self.roles_path.iterdir():
-            if not role_dir.is_dir():
-                continue
-                
+        for role_name in sorted(role_names):
+            role_dir = self.roles_path / role_name
             meta_file = role_dir / "meta" / "main.yml"
-            if meta_file.exists():
+            if self._exists(meta_file):
                 try:
-                    with open(meta_file, 'r') as f:
-                        meta_data = yaml.safe_load(f) or {}
+                    meta_data = self._load_yaml(meta_file) or {}
+                    if meta_file in self._broken_files:
+                        continue
                     
                     # Validate dependencies
                     dependencies = meta_data.get('dependencies', [])
@@ -242,8 +549,7 @@ class ConfigurationValidator:
                             dep_name = dep
                         
                         if dep_name:
-                            dep_path = self.roles_path / dep_name
-                            if not dep_path.exists():
+                            if dep_name not in role_names:
                                 self.warnings.append(f"Role dependency not found: {dep_name} (required by {role_dir.name})")
                                 
                 except Exception as e:
@@ -255,13 +561,15 @@ class ConfigurationValidator:
         
         # Check for vault password file
         vault_pass_file = self.base_path / ".vault_pass"
-        if not vault_pass_file.exists():
+        if not self._exists(vault_pass_file):
             self.warnings.append("Vault password file (.vault_pass) not found")
         
         # Validate SSH configuration
         try:
-            with open(self.inventory_path / "group_vars/all.yml", 'r') as f:
-                all_vars = yaml.safe_load(f) or {}
+            all_vars_file = self.inventory_path / "group_vars/all.yml"
+            all_vars = self._load_yaml(all_vars_file) or {}
+            if all_vars_file in self._broken_files:
+                return
             
             # Check SSH security settings
             ssh_port = all_vars.get('ssh_port', 22)
@@ -282,42 +590,52 @@ class ConfigurationValidator:
     
     def print_results(self):
         """Print validation results"""
-        print("\n" + "="*60)
-        print("CONFIGURATION VALIDATION RESULTS")
-        print("="*60)
+        # Build the whole report and write it in one call
+        lines = ["", "="*60, "CONFIGURATION VALIDATION RESULTS", "="*60]
+        append = lines.append
         
         if self.errors:
-            print(f"\n❌ ERRORS ({len(self.errors)}):")
+            append(f"\n❌ ERRORS ({len(self.errors)}):")
             for i, error in enumerate(self.errors, 1):
-                print(f"  {i}. {error}")
+                append(f"  {i}. {error}")
         
         if self.warnings:
-            print(f"\n⚠️  WARNINGS ({len(self.warnings)}):")
+            append(f"\n⚠️  WARNINGS ({len(self.warnings)}):")
             for i, warning in enumerate(self.warnings, 1):
-                print(f"  {i}. {warning}")
+                append(f"  {i}. {warning}")
         
         if not self.errors and not self.warnings:
-            print("\n✅ All configuration validations passed!")
+            append("\n✅ All configuration validations passed!")
         elif not self.errors:
-            print(f"\n✅ No errors found, but {len(self.warnings)} warnings to review")
+            append(f"\n✅ No errors found, but {len(self.warnings)} warnings to review")
         else:
-            print(f"\n❌ Validation failed with {len(self.errors)} errors and {len(self.warnings)} warnings")
+            append(f"\n❌ Validation failed with {len(self.errors)} errors and {len(self.warnings)} warnings")
         
-        print("="*60)
+        append("="*60)
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(description="Validate VPN infrastructure configuration")
     parser.add_argument("--path", "-p", default=".", help="Base path to validate (default: current directory)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    parser.add_argument("--only", action="append", choices=list(ConfigurationValidator.STAGES),
+                        help="Run only this validation stage (repeatable)")
     
     args = parser.parse_args()
     
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
     validator = ConfigurationValidator(args.path)
-    success = validator.validate_all()
+    success = validator.validate_all(args.only)
     
     sys.exit(0 if success else 1)
 
@@ -11,18 +11,197 @@ import os
 import argparse
 import ipaddress
 import re
-from typing import Dict, List, Any, Tuple, Set
+from typing import Dict, List, Any, Tuple, Set, Optional, Iterator
 import logging
+import hashlib
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 
+# Use the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# orjson is optional; stdlib json is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson is optional; when installed the dynamic inventory is parsed while the script is still writing it
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Reports for unchanged static inventories are reused from here
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                         'inventory-validator')
+
+# Read size for dynamic inventory output, so multi-MB JSON is pulled from the pipe in few reads
+PIPE_BUFFER_SIZE = 1 << 20
+
+# Inventories with at least this many hosts are validated across worker processes
+PARALLEL_MIN_HOSTS = 5000
+HOST_CHUNK_SIZE = 500
+
+# Results are recorded as {'code': ..., **fields} and only turned into text for the text report
+MESSAGES = {
+    'required_group_missing': "Required group '{group}' not found in inventory",
+    'required_group_found': "Required group '{group}' found",
+    'meta_missing': "Missing '_meta' section in inventory",
+    'hostvars_missing': "Missing 'hostvars' in _meta section",
+    'structure_valid': "Inventory structure is valid",
+    'hosts_unchecked': "Cannot validate hosts: missing hostvars",
+    'orphaned_hostvars': "Orphaned host variables found for: {hosts}",
+    'hostname_format': "Host '{host}' doesn't match naming convention",
+    'missing_var': "Host '{host}' missing required variable '{var}'",
+    'private_ip': "Host '{host}' has private IP outside allowed ranges: {ip}",
+    'public_ip': "Host '{host}' has valid public IP: {ip}",
+    'invalid_ip': "Host '{host}' has invalid IP address: {ip}",
+    'capacity_below_min': "Host '{host}' capacity {capacity} below minimum {limit}",
+    'capacity_above_max': "Host '{host}' capacity {capacity} above maximum {limit}",
+    'capacity_above_recommended': "Host '{host}' capacity {capacity} above recommended maximum {limit}",
+    'valid_capacity': "Host '{host}' has valid capacity: {capacity}",
+    'invalid_capacity': "Host '{host}' has invalid capacity value: {capacity}",
+    'invalid_protocols': "Host '{host}' protocols must be string or list: {protocols}",
+    'unsupported_protocols': "Host '{host}' has unsupported protocols: {protocols}",
+    'missing_protocols': "Host '{host}' missing recommended protocols: {protocols}",
+    'valid_protocols': "Host '{host}' has valid protocols: {protocols}",
+    'unsupported_region': "Host '{host}' has unsupported region: {region}",
+    'valid_region': "Host '{host}' has valid region: {region}",
+    'missing_ssh_key': "Host '{host}' missing SSH key configuration",
+    'monitoring_disabled': "Host '{host}' monitoring not enabled",
+    'exclusive_group_overlap': "Host '{host}' in multiple exclusive groups: {groups}",
+    'no_servers': "No servers found in any region",
+    'empty_region': "No servers in region: {region}",
+    'region_low': "Region '{region}' has low server count: {count} (avg: {avg:.1f})",
+    'region_high': "Region '{region}' has high server count: {count} (avg: {avg:.1f})",
+    'no_capacity_info': "No capacity information found",
+    'total_capacity': "Total infrastructure capacity: {capacity} connections",
+    'average_capacity': "Average server capacity: {avg:.1f} connections",
+    'capacity_low': "Server has very low capacity: {capacity} (avg: {avg:.1f})",
+    'capacity_high': "Server has very high capacity: {capacity} (avg: {avg:.1f})",
+    'validation_failed': "Validation failed: {reason}"
+}
+
+# A single result record, e.g. {'code': 'missing_var', 'host': ..., 'var': ...}
+Result = Dict[str, Any]
+
+# One host's (passed, passed count, warnings, errors); passed is None unless collecting
+HostResults = Tuple[Optional[List[Result]], int, List[Result], List[Result]]
+
+# Record fields holding lists that are shown comma-separated
+LIST_FIELDS = ('hosts', 'protocols', 'groups')
+
+# Classifies a stripped INI inventory line as a group header or a host entry in one match
+INI_LINE_RE = re.compile(r'\[(?P<group>.*)\]$|(?P<host>[^#\s]\S*)')
+
+# Unique addresses seen in one inventory; hostvars often repeat the same IPs
+IP_CACHE_SIZE = 16384
+
+@lru_cache(maxsize=IP_CACHE_SIZE)
+def _parse_ip(ip_addr: str) -> Any:
+    """Parse an IP address once per distinct value"""
+    return ipaddress.ip_address(ip_addr)
+
+@lru_cache(maxsize=IP_CACHE_SIZE)
+def _private_ip_allowed(ip: Any, allowed_nets: Tuple[Any, ...]) -> Optional[bool]:
+    """None for a public address, else whether the private address is in an allowed network"""
+    if not ip.is_private:
+        return None
+    return any(ip in net for net in allowed_nets)
+
+# .get() defaults: _MISSING for host variables that may legitimately be None,
+# _EMPTY (never mutated) for absent sections and hosts without variables
+_MISSING = object()
+_EMPTY = {}
+
+def _get_hostvars(inventory: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The inventory's _meta.hostvars mapping, or None when it is missing"""
+    meta = inventory.get('_meta', _EMPTY)
+    hostvars = meta.get('hostvars') if isinstance(meta, dict) else None
+    return hostvars if isinstance(hostvars, dict) else None
+
+# Per-process copy of the validator, installed by the pool initializer
+_worker_validator = None
+
+def _init_host_worker(validator: 'InventoryValidator') -> None:
+    """Process pool initializer: keep the validator (with compiled rules) for the worker's tasks"""
+    global _worker_validator
+    _worker_validator = validator
+
+def _validate_host_chunk(chunk: List[Tuple[str, Dict[str, Any]]]) -> List[HostResults]:
+    """Validate (hostname, host_vars) pairs in a worker, one HostResults per host"""
+    validator = _worker_validator
+    return [validator.validate_host_results(hostname, host_vars) for hostname, host_vars in chunk]
+
+def _host_vars_digest(host_vars: Dict[str, Any]) -> Optional[str]:
+    """Stable digest of a host's variables, or None when they cannot be serialized"""
+    try:
+        if orjson is not None:
+            data = orjson.dumps(host_vars, option=orjson.OPT_SORT_KEYS)
+        else:
+            data = json.dumps(host_vars, sort_keys=True).encode()
+    except TypeError:
+        return None
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _is_result_list(value: Any) -> bool:
+    """Whether a cached value is a list of result records with known codes"""
+    return isinstance(value, list) and all(
+        isinstance(record, dict) and record.get('code') in MESSAGES for record in value)
+
+def _valid_host_cache_entry(entry: Any, collect_passed: bool) -> bool:
+    """Whether a host cache entry has the [digest, *HostResults] shape validate_hosts reuses"""
+    if not isinstance(entry, list) or len(entry) != 5:
+        return False
+    digest, passed, passed_count, warnings, errors = entry
+    return (isinstance(digest, str)
+            and (_is_result_list(passed) if collect_passed else passed is None)
+            and type(passed_count) is int
+            and _is_result_list(warnings) and _is_result_list(errors))
+
+def _write_cache_file(cache_path: str, data: bytes) -> None:
+    """Write a cache file through a temp file, so a concurrent run never reads a partial one"""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, cache_path)
+
 class InventoryValidator:
-    def __init__(self, inventory_path: str = None, config_path: str = None):
+    # Validation checks in run order, selectable with --checks
+    CHECKS = {
+        'structure': ('inventory structure', 'validate_inventory_structure'),
+        'hosts': ('hosts', 'validate_hosts'),
+        'groups': ('group consistency', 'validate_group_consistency'),
+        'regional': ('regional distribution', 'validate_regional_distribution'),
+        'capacity': ('capacity distribution', 'validate_capacity_distribution')
+    }
+    
+    def __init__(self, inventory_path: str = None, config_path: str = None, collect_passed: bool = False,
+                 use_cache: bool = True, checks: Optional[List[str]] = None):
         self.inventory_path = inventory_path or 'inventories/production'
         self.config_path = config_path or 'inventories/validation-config.yml'
+        self.use_cache = use_cache
+        self.checks = frozenset(checks) if checks else frozenset(self.CHECKS)
+        # Passed checks are always counted; their messages are only kept when asked for
+        self._collect_passed = collect_passed
+        self._passed_count = 0
+        # Filled in by _scan_inventory and read by the validators
+        self._all_hosts = set()
+        self._hosts_by_group = {}
+        self._group_sizes = {}
+        self._capacities = []
         self.validation_results = {
             'passed': [],
             'warnings': [],
@@ -84,7 +263,7 @@ class InventoryValidator:
         
         if os.path.exists(self.config_path):
             with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=SafeLoader)
                 # Merge with defaults
                 for key, value in default_config.items():
                     if key not in config:
@@ -93,51 +272,90 @@ class InventoryValidator:
         else:
             return default_config
     
+    def compile_rules(self) -> None:
+        """Snapshot the config slices used per host into attributes, compiling the hostname pattern"""
+        config = self.config
+        # Bound match of the compiled pattern, called once per host
+        self._hostname_match = re.compile(config['naming_conventions']['hostname_pattern']).match
+        self._required_host_vars = tuple(config['required_host_vars'])
+        limits = config['capacity_limits']
+        self._cap_min, self._cap_max, self._cap_rec = limits['min'], limits['max'], limits['recommended_max']
+        self._allowed_private_nets = tuple(ipaddress.ip_network(net) for net in config['ip_ranges']['allowed_private'])
+        self._supported_protocols = frozenset(config['protocols']['supported'])
+        self._required_protocols = frozenset(config['protocols']['required'])
+        self._supported_regions = frozenset(config['regions']['supported'])
+        security_req = config['security_requirements']
+        self._ssh_key_required = security_req['ssh_key_required']
+        self._monitoring_required = security_req['monitoring_required']
+    
     def load_inventory(self) -> Dict[str, Any]:
         """Load inventory from file or dynamic script"""
         if os.path.isfile(self.inventory_path):
             # Static inventory file
             with open(self.inventory_path, 'r') as f:
                 if self.inventory_path.endswith('.yml') or self.inventory_path.endswith('.yaml'):
-                    return yaml.safe_load(f)
+                    return yaml.load(f, Loader=SafeLoader)
                 else:
                     # Assume INI format, convert to dict
                     return self.parse_ini_inventory(f.read())
         elif os.path.isfile(f"{self.inventory_path}.py"):
             # Dynamic inventory script
-            import subprocess
-            result = subprocess.run([f"{self.inventory_path}.py", "--list"], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            else:
-                raise Exception(f"Dynamic inventory script failed: {result.stderr}")
+            return self.load_dynamic_inventory(f"{self.inventory_path}.py")
         else:
             raise FileNotFoundError(f"Inventory not found: {self.inventory_path}")
     
+    def load_dynamic_inventory(self, script: str) -> Dict[str, Any]:
+        """Run a dynamic inventory script and parse its JSON output from the pipe"""
+        # stderr goes to a temp file so a chatty script cannot block on a full pipe
+        with tempfile.TemporaryFile() as stderr, \
+                subprocess.Popen([script, "--list"], stdout=subprocess.PIPE, stderr=stderr,
+                                 bufsize=PIPE_BUFFER_SIZE) as proc:
+            try:
+                # Only a top-level object can be streamed; anything else is parsed whole
+                # so the validators see the same value as with the other parsers
+                if ijson is not None and proc.stdout.peek().lstrip().startswith(b'{'):
+                    # Top-level groups are built one at a time as the output streams in
+                    inventory = dict(ijson.kvitems(proc.stdout, '', use_float=True, buf_size=PIPE_BUFFER_SIZE))
+                elif orjson is not None:
+                    inventory = orjson.loads(proc.stdout.read())
+                else:
+                    inventory = json.load(proc.stdout)
+            except Exception:
+                # Drain the rest of the output so a script still writing cannot block on a full pipe
+                proc.stdout.read()
+                if proc.wait() == 0:
+                    raise
+                inventory = None
+            
+            if proc.wait() != 0:
+                stderr.seek(0)
+                raise Exception(f"Dynamic inventory script failed: {stderr.read().decode(errors='replace')}")
+        
+        return inventory
+    
     def parse_ini_inventory(self, content: str) -> Dict[str, Any]:
         """Parse INI format inventory into dict format"""
         inventory = {'_meta': {'hostvars': {}}}
         current_group = None
+        match_line = INI_LINE_RE.match
         
-        for line in content.split('\n'):
-            line = line.strip()
-            if not line or line.startswith('#'):
+        for line in content.splitlines():
+            # Blank lines and comments do not match
+            m = match_line(line.strip())
+            if m is None:
                 continue
                 
-            if line.startswith('[') and line.endswith(']'):
-                current_group = line[1:-1]
+            if m.lastgroup == 'group':
+                current_group = m.group('group')
                 if ':vars' not in current_group and ':children' not in current_group:
                     inventory[current_group] = {'hosts': []}
             elif current_group and '=' in line:
                 # Variable assignment
-                key, value = line.split('=', 1)
                 # Handle group vars or host vars
                 pass  # Simplified for now
-            elif current_group and line:
+            elif current_group:
                 # Host entry
-                hostname = line.split()[0]
-                inventory[current_group]['hosts'].append(hostname)
+                inventory[current_group]['hosts'].append(m.group('host'))
         
         return inventory
     
@@ -147,201 +365,265 @@ class InventoryValidator:
         # Check for required groups
         for group in self.config['required_groups']:
             if group not in inventory:
-                self.validation_results['errors'].append(
-                    f"Required group '{group}' not found in inventory"
-                )
+                self.validation_results['errors'].append({'code': 'required_group_missing', 'group': group})
             else:
-                self.validation_results['passed'].append(
-                    f"Required group '{group}' found"
-                )
+                self.record_passed({'code': 'required_group_found', 'group': group})
         
         # Check for _meta section
         if '_meta' not in inventory:
-            self.validation_results['errors'].append("Missing '_meta' section in inventory")
+            self.validation_results['errors'].append({'code': 'meta_missing'})
         elif 'hostvars' not in inventory['_meta']:
-            self.validation_results['errors'].append("Missing 'hostvars' in _meta section")
+            self.validation_results['errors'].append({'code': 'hostvars_missing'})
         else:
-            self.validation_results['passed'].append("Inventory structure is valid")
+            self.record_passed({'code': 'structure_valid'})
+    
+    def _scan_inventory(self, inventory: Dict[str, Any]) -> None:
+        """Collect hosts, group membership, group sizes and capacities in a single walk"""
+        all_hosts = set()
+        hosts_by_group = {}
+        group_sizes = {}
+        # Only what the selected checks read is collected; hostvars are not walked unless needed
+        group_items = inventory.items() if not self.checks.isdisjoint(('hosts', 'groups', 'regional')) else ()
+        for group_name, group_data in group_items:
+            if group_name == '_meta' or not isinstance(group_data, dict):
+                continue
+            hosts = group_data.get('hosts')
+            if hosts is None:
+                continue
+            group_hosts = set(hosts)
+            hosts_by_group[group_name] = group_hosts
+            group_sizes[group_name] = len(hosts)
+            all_hosts.update(hosts)
+        
+        capacities = []
+        hostvars = _get_hostvars(inventory) if 'capacity' in self.checks else None
+        if hostvars is not None:
+            for host_vars in hostvars.values():
+                capacity = host_vars.get('server_capacity')
+                if capacity is not None:
+                    try:
+                        capacities.append(int(capacity))
+                    except (ValueError, TypeError):
+                        continue
+        
+        self._all_hosts = all_hosts
+        self._hosts_by_group = hosts_by_group
+        self._group_sizes = group_sizes
+        self._capacities = capacities
+    
+    def record_passed(self, record: Result) -> None:
+        """Count a passed check, keeping its record only when collecting passed checks"""
+        self._passed_count += 1
+        if self._collect_passed:
+            self.validation_results['passed'].append(record)
     
     def validate_hosts(self, inventory: Dict[str, Any]) -> None:
         """Validate individual hosts"""
         
-        if '_meta' not in inventory or 'hostvars' not in inventory['_meta']:
-            self.validation_results['critical'].append("Cannot validate hosts: missing hostvars")
+        hostvars = _get_hostvars(inventory)
+        if hostvars is None:
+            self.validation_results['critical'].append({'code': 'hosts_unchecked'})
             return
         
-        hostvars = inventory['_meta']['hostvars']
-        all_hosts = set()
+        all_hosts = self._all_hosts
+        host_cache = self.load_host_cache()
         
-        # Collect all hosts from groups
-        for group_name, group_data in inventory.items():
-            if group_name == '_meta':
-                continue
-            if isinstance(group_data, dict) and 'hosts' in group_data:
-                all_hosts.update(group_data['hosts'])
+        # Hosts whose variables are unchanged since the last run reuse their cached results
+        digests = {}
+        pending = []
+        for hostname in all_hosts:
+            host_vars = hostvars.get(hostname, _EMPTY)
+            if host_cache is not None:
+                digest = digests[hostname] = _host_vars_digest(host_vars)
+                if digest is not None and host_cache.get(hostname, (None,))[0] == digest:
+                    continue
+            pending.append((hostname, host_vars))
         
-        # Validate each host
+        if len(pending) >= PARALLEL_MIN_HOSTS and (os.cpu_count() or 1) > 1:
+            chunks = [pending[i:i + HOST_CHUNK_SIZE] for i in range(0, len(pending), HOST_CHUNK_SIZE)]
+            with ProcessPoolExecutor(initializer=_init_host_worker, initargs=(self,)) as executor:
+                # map() keeps chunk order, so results line up with pending
+                results = [r for chunk_results in executor.map(_validate_host_chunk, chunks) for r in chunk_results]
+        else:
+            validate_host_results = self.validate_host_results
+            results = [validate_host_results(hostname, host_vars) for hostname, host_vars in pending]
+        fresh = {hostname: result for (hostname, _), result in zip(pending, results)}
+        if pending:
+            logger.debug(f"Validated {len(pending)} of {len(all_hosts)} hosts")
+        
+        # Merge per-host results in host order into local lists, added to the results once
+        passed = [] if self._collect_passed else None
+        warnings, errors = [], []
         for hostname in all_hosts:
-            self.validate_single_host(hostname, hostvars.get(hostname, {}))
+            host_passed, passed_count, host_warnings, host_errors = (
+                fresh[hostname] if hostname in fresh else host_cache[hostname][1:])
+            if passed is not None:
+                passed.extend(host_passed)
+            self._passed_count += passed_count
+            warnings.extend(host_warnings)
+            errors.extend(host_errors)
+        
+        if passed:
+            self.validation_results['passed'].extend(passed)
+        self.validation_results['warnings'].extend(warnings)
+        self.validation_results['errors'].extend(errors)
+        
+        if host_cache is not None:
+            self.save_host_cache({
+                hostname: [digest, *(fresh[hostname] if hostname in fresh else host_cache[hostname][1:])]
+                for hostname, digest in digests.items() if digest is not None
+            })
         
         # Check for orphaned hostvars
         hostvar_hosts = set(hostvars.keys())
         orphaned = hostvar_hosts - all_hosts
         if orphaned:
-            self.validation_results['warnings'].append(
-                f"Orphaned host variables found for: {', '.join(orphaned)}"
-            )
+            self.validation_results['warnings'].append({'code': 'orphaned_hostvars', 'hosts': list(orphaned)})
     
-    def validate_single_host(self, hostname: str, host_vars: Dict[str, Any]) -> None:
-        """Validate a single host configuration"""
+    def validate_host_results(self, hostname: str, host_vars: Dict[str, Any]) -> HostResults:
+        """Validate a single host into its own result lists"""
+        passed = [] if self._collect_passed else None
+        warnings, errors = [], []
+        total = self._passed_count
+        self._passed_count = 0
+        try:
+            self.validate_single_host(hostname, host_vars, passed, warnings, errors)
+            return passed, self._passed_count, warnings, errors
+        finally:
+            self._passed_count = total
+    
+    def validate_single_host(self, hostname: str, host_vars: Dict[str, Any],
+                             passed: Optional[List[Result]], warnings: List[Result], errors: List[Result]) -> None:
+        """Validate a single host configuration, appending result records to the given lists"""
         
         # Check hostname format
-        if not re.match(self.config['naming_conventions']['hostname_pattern'], hostname):
-            self.validation_results['warnings'].append(
-                f"Host '{hostname}' doesn't match naming convention"
-            )
+        if not self._hostname_match(hostname):
+            warnings.append({'code': 'hostname_format', 'host': hostname})
         
         # Check required host variables
-        for var in self.config['required_host_vars']:
+        for var in self._required_host_vars:
             if var not in host_vars:
-                self.validation_results['errors'].append(
-                    f"Host '{hostname}' missing required variable '{var}'"
-                )
+                errors.append({'code': 'missing_var', 'host': hostname, 'var': var})
         
         # Validate IP addresses
-        if 'ansible_host' in host_vars:
-            self.validate_ip_address(hostname, host_vars['ansible_host'])
+        ip_addr = host_vars.get('ansible_host', _MISSING)
+        if ip_addr is not _MISSING:
+            self.validate_ip_address(hostname, ip_addr, passed, warnings, errors)
         
         # Validate capacity
-        if 'server_capacity' in host_vars:
-            self.validate_capacity(hostname, host_vars['server_capacity'])
+        capacity = host_vars.get('server_capacity', _MISSING)
+        if capacity is not _MISSING:
+            self.validate_capacity(hostname, capacity, passed, warnings, errors)
         
         # Validate protocols
-        if 'server_protocols' in host_vars:
-            self.validate_protocols(hostname, host_vars['server_protocols'])
+        protocols = host_vars.get('server_protocols', _MISSING)
+        if protocols is not _MISSING:
+            self.validate_protocols(hostname, protocols, passed, warnings, errors)
         
         # Validate region
-        if 'server_region' in host_vars:
-            self.validate_region(hostname, host_vars['server_region'])
+        region = host_vars.get('server_region', _MISSING)
+        if region is not _MISSING:
+            self.validate_region(hostname, region, passed, warnings, errors)
         
         # Check security requirements
-        self.validate_security_config(hostname, host_vars)
+        self.validate_security_config(hostname, host_vars, passed, warnings, errors)
     
-    def validate_ip_address(self, hostname: str, ip_addr: str) -> None:
+    def validate_ip_address(self, hostname: str, ip_addr: str,
+                            passed: Optional[List[Result]], warnings: List[Result], errors: List[Result]) -> None:
         """Validate IP address format and ranges"""
         try:
-            ip = ipaddress.ip_address(ip_addr)
+            ip = _parse_ip(ip_addr)
             
             # Check if IP is in allowed ranges
-            if ip.is_private:
-                allowed = any(ip in ipaddress.ip_network(net) 
-                            for net in self.config['ip_ranges']['allowed_private'])
-                if not allowed:
-                    self.validation_results['warnings'].append(
-                        f"Host '{hostname}' has private IP outside allowed ranges: {ip_addr}"
-                    )
-            else:
+            allowed = _private_ip_allowed(ip, self._allowed_private_nets)
+            if allowed is False:
+                warnings.append({'code': 'private_ip', 'host': hostname, 'ip': ip_addr})
+            elif allowed is None:
                 # Public IP validation could be added here
-                self.validation_results['passed'].append(
-                    f"Host '{hostname}' has valid public IP: {ip_addr}"
-                )
+                if passed is not None:
+                    passed.append({'code': 'public_ip', 'host': hostname, 'ip': ip_addr})
+                self._passed_count += 1
                 
-        except ValueError:
-            self.validation_results['errors'].append(
-                f"Host '{hostname}' has invalid IP address: {ip_addr}"
-            )
+        # Unhashable values (lists, mappings) cannot be cached and are never addresses
+        except (ValueError, TypeError):
+            errors.append({'code': 'invalid_ip', 'host': hostname, 'ip': ip_addr})
     
-    def validate_capacity(self, hostname: str, capacity: Any) -> None:
+    def validate_capacity(self, hostname: str, capacity: Any,
+                          passed: Optional[List[Result]], warnings: List[Result], errors: List[Result]) -> None:
         """Validate server capacity configuration"""
         try:
             cap = int(capacity)
-            limits = self.config['capacity_limits']
             
-            if cap < limits['min']:
-                self.validation_results['errors'].append(
-                    f"Host '{hostname}' capacity {cap} below minimum {limits['min']}"
-                )
-            elif cap > limits['max']:
-                self.validation_results['errors'].append(
-                    f"Host '{hostname}' capacity {cap} above maximum {limits['max']}"
-                )
-            elif cap > limits['recommended_max']:
-                self.validation_results['warnings'].append(
-                    f"Host '{hostname}' capacity {cap} above recommended maximum {limits['recommended_max']}"
-                )
+            if cap < self._cap_min:
+                errors.append({'code': 'capacity_below_min', 'host': hostname, 'capacity': cap, 'limit': self._cap_min})
+            elif cap > self._cap_max:
+                errors.append({'code': 'capacity_above_max', 'host': hostname, 'capacity': cap, 'limit': self._cap_max})
+            elif cap > self._cap_rec:
+                warnings.append({'code': 'capacity_above_recommended', 'host': hostname, 'capacity': cap,
+                                 'limit': self._cap_rec})
             else:
-                self.validation_results['passed'].append(
-                    f"Host '{hostname}' has valid capacity: {cap}"
-                )
+                if passed is not None:
+                    passed.append({'code': 'valid_capacity', 'host': hostname, 'capacity': cap})
+                self._passed_count += 1
                 
         except (ValueError, TypeError):
-            self.validation_results['errors'].append(
-                f"Host '{hostname}' has invalid capacity value: {capacity}"
-            )
+            errors.append({'code': 'invalid_capacity', 'host': hostname, 'capacity': capacity})
     
-    def validate_protocols(self, hostname: str, protocols: Any) -> None:
+    def validate_protocols(self, hostname: str, protocols: Any,
+                           passed: Optional[List[Result]], warnings: List[Result], errors: List[Result]) -> None:
         """Validate VPN protocols configuration"""
         if isinstance(protocols, str):
             protocols = [protocols]
         elif not isinstance(protocols, list):
-            self.validation_results['errors'].append(
-                f"Host '{hostname}' protocols must be string or list: {protocols}"
-            )
+            errors.append({'code': 'invalid_protocols', 'host': hostname, 'protocols': protocols})
             return
         
-        supported = self.config['protocols']['supported']
-        required = self.config['protocols']['required']
+        protocol_set = frozenset(protocols)
         
         # Check for unsupported protocols
-        unsupported = set(protocols) - set(supported)
+        unsupported = protocol_set - self._supported_protocols
         if unsupported:
-            self.validation_results['errors'].append(
-                f"Host '{hostname}' has unsupported protocols: {', '.join(unsupported)}"
-            )
+            errors.append({'code': 'unsupported_protocols', 'host': hostname, 'protocols': list(unsupported)})
         
         # Check for required protocols
-        missing_required = set(required) - set(protocols)
+        missing_required = self._required_protocols - protocol_set
         if missing_required:
-            self.validation_results['warnings'].append(
-                f"Host '{hostname}' missing recommended protocols: {', '.join(missing_required)}"
-            )
+            warnings.append({'code': 'missing_protocols', 'host': hostname, 'protocols': list(missing_required)})
         
         if not unsupported and not missing_required:
-            self.validation_results['passed'].append(
-                f"Host '{hostname}' has valid protocols: {', '.join(protocols)}"
-            )
+            if passed is not None:
+                passed.append({'code': 'valid_protocols', 'host': hostname, 'protocols': protocols})
+            self._passed_count += 1
     
-    def validate_region(self, hostname: str, region: str) -> None:
+    def validate_region(self, hostname: str, region: str,
+                        passed: Optional[List[Result]], warnings: List[Result], errors: List[Result]) -> None:
         """Validate region configuration"""
-        supported = self.config['regions']['supported']
+        try:
+            supported = region in self._supported_regions
+        except TypeError:
+            # Unhashable values (lists, mappings) can never name a region
+            supported = False
         
-        if region not in supported:
-            self.validation_results['errors'].append(
-                f"Host '{hostname}' has unsupported region: {region}"
-            )
+        if not supported:
+            errors.append({'code': 'unsupported_region', 'host': hostname, 'region': region})
         else:
-            self.validation_results['passed'].append(
-                f"Host '{hostname}' has valid region: {region}"
-            )
+            if passed is not None:
+                passed.append({'code': 'valid_region', 'host': hostname, 'region': region})
+            self._passed_count += 1
     
-    def validate_security_config(self, hostname: str, host_vars: Dict[str, Any]) -> None:
+    def validate_security_config(self, hostname: str, host_vars: Dict[str, Any],
+                                 passed: Optional[List[Result]], warnings: List[Result], errors: List[Result]) -> None:
         """Validate security configuration"""
-        security_req = self.config['security_requirements']
-        
         # Check SSH key requirement
-        if security_req['ssh_key_required']:
+        if self._ssh_key_required:
             ssh_key_vars = ['ansible_ssh_private_key_file', 'ansible_ssh_key_file']
             if not any(var in host_vars for var in ssh_key_vars):
-                self.validation_results['warnings'].append(
-                    f"Host '{hostname}' missing SSH key configuration"
-                )
+                warnings.append({'code': 'missing_ssh_key', 'host': hostname})
         
         # Check monitoring requirement
-        if security_req['monitoring_required']:
+        if self._monitoring_required:
             if not host_vars.get('monitoring_enabled', False):
-                self.validation_results['warnings'].append(
-                    f"Host '{hostname}' monitoring not enabled"
-                )
+                warnings.append({'code': 'monitoring_disabled', 'host': hostname})
     
     def validate_group_consistency(self, inventory: Dict[str, Any]) -> None:
         """Validate consistency across groups"""
@@ -356,89 +638,73 @@ class InventoryValidator:
             if group_set == ['wireguard_servers', 'openvpn_servers']:
                 continue  # Allow protocol overlap
                 
-            hosts_in_groups = {}
-            for group in group_set:
-                if group in inventory and 'hosts' in inventory[group]:
-                    hosts_in_groups[group] = set(inventory[group]['hosts'])
+            hosts_in_groups = {group: self._hosts_by_group[group]
+                               for group in group_set if group in self._hosts_by_group}
             
-            # Check for overlaps in regional groups
-            if len(hosts_in_groups) > 1:
-                all_hosts = set()
-                for group, hosts in hosts_in_groups.items():
-                    overlaps = all_hosts & hosts
-                    if overlaps:
-                        self.validation_results['errors'].append(
-                            f"Hosts in multiple exclusive groups: {', '.join(overlaps)}"
-                        )
-                    all_hosts.update(hosts)
+            # Check for overlaps in regional groups; pairwise isdisjoint settles the common case
+            groups = list(hosts_in_groups.items())
+            if all(hosts.isdisjoint(other) for i, (_, hosts) in enumerate(groups) for _, other in groups[i + 1:]):
+                continue
+            
+            # One pass mapping each host to its groups, reported once per host
+            host_groups = {}
+            for group, hosts in groups:
+                for host in hosts:
+                    host_groups.setdefault(host, []).append(group)
+            for host, member_of in host_groups.items():
+                if len(member_of) > 1:
+                    self.validation_results['errors'].append(
+                        {'code': 'exclusive_group_overlap', 'host': host, 'groups': member_of}
+                    )
     
     def validate_regional_distribution(self, inventory: Dict[str, Any]) -> None:
         """Validate regional distribution of servers"""
         regional_groups = ['europe', 'north_america', 'asia_pacific']
-        region_counts = {}
-        
-        for region in regional_groups:
-            if region in inventory and 'hosts' in inventory[region]:
-                region_counts[region] = len(inventory[region]['hosts'])
-            else:
-                region_counts[region] = 0
+        region_counts = {region: self._group_sizes.get(region, 0) for region in regional_groups}
         
         total_servers = sum(region_counts.values())
         if total_servers == 0:
-            self.validation_results['critical'].append("No servers found in any region")
+            self.validation_results['critical'].append({'code': 'no_servers'})
             return
         
         # Check for balanced distribution (within 50% of average)
         avg_per_region = total_servers / len(regional_groups)
         for region, count in region_counts.items():
             if count == 0:
-                self.validation_results['warnings'].append(f"No servers in region: {region}")
+                self.validation_results['warnings'].append({'code': 'empty_region', 'region': region})
             elif count < avg_per_region * 0.5:
                 self.validation_results['warnings'].append(
-                    f"Region '{region}' has low server count: {count} (avg: {avg_per_region:.1f})"
+                    {'code': 'region_low', 'region': region, 'count': count, 'avg': avg_per_region}
                 )
             elif count > avg_per_region * 1.5:
                 self.validation_results['warnings'].append(
-                    f"Region '{region}' has high server count: {count} (avg: {avg_per_region:.1f})"
+                    {'code': 'region_high', 'region': region, 'count': count, 'avg': avg_per_region}
                 )
     
     def validate_capacity_distribution(self, inventory: Dict[str, Any]) -> None:
         """Validate capacity distribution across servers"""
-        if '_meta' not in inventory or 'hostvars' not in inventory['_meta']:
+        if _get_hostvars(inventory) is None:
             return
         
-        capacities = []
-        for hostname, host_vars in inventory['_meta']['hostvars'].items():
-            if 'server_capacity' in host_vars:
-                try:
-                    capacities.append(int(host_vars['server_capacity']))
-                except (ValueError, TypeError):
-                    continue
-        
+        capacities = self._capacities
         if not capacities:
-            self.validation_results['warnings'].append("No capacity information found")
+            self.validation_results['warnings'].append({'code': 'no_capacity_info'})
             return
         
         total_capacity = sum(capacities)
         avg_capacity = total_capacity / len(capacities)
         
-        self.validation_results['passed'].append(
-            f"Total infrastructure capacity: {total_capacity} connections"
-        )
-        self.validation_results['passed'].append(
-            f"Average server capacity: {avg_capacity:.1f} connections"
-        )
-        
-        # Check for capacity outliers
-        for i, capacity in enumerate(capacities):
-            if capacity < avg_capacity * 0.3:
-                self.validation_results['warnings'].append(
-                    f"Server has very low capacity: {capacity} (avg: {avg_capacity:.1f})"
-                )
-            elif capacity > avg_capacity * 3:
-                self.validation_results['warnings'].append(
-                    f"Server has very high capacity: {capacity} (avg: {avg_capacity:.1f})"
-                )
+        self.record_passed({'code': 'total_capacity', 'capacity': total_capacity})
+        self.record_passed({'code': 'average_capacity', 'avg': avg_capacity})
+        
+        # Check for capacity outliers; thresholds are computed once
+        low, high = avg_capacity * 0.3, avg_capacity * 3
+        append = self.validation_results['warnings'].append
+        for capacity in capacities:
+            if capacity < low:
+                append({'code': 'capacity_low', 'capacity': capacity, 'avg': avg_capacity})
+            elif capacity > high:
+                append({'code': 'capacity_high', 'capacity': capacity, 'avg': avg_capacity})
     
     def generate_report(self) -> Dict[str, Any]:
         """Generate validation report"""
@@ -446,8 +712,9 @@ class InventoryValidator:
             'timestamp': datetime.now().isoformat(),
             'inventory_path': self.inventory_path,
             'validation_summary': {
-                'total_checks': sum(len(v) for v in self.validation_results.values()),
-                'passed': len(self.validation_results['passed']),
+                'total_checks': self._passed_count + sum(
+                    len(v) for k, v in self.validation_results.items() if k != 'passed'),
+                'passed': self._passed_count,
                 'warnings': len(self.validation_results['warnings']),
                 'errors': len(self.validation_results['errors']),
                 'critical': len(self.validation_results['critical'])
@@ -469,26 +736,112 @@ class InventoryValidator:
         else:
             return 'PASSED'
     
+    def report_cache_path(self) -> Optional[str]:
+        """Cache file for this run, keyed on the inventory, config and validator contents"""
+        # Dynamic inventories can change without their script changing
+        if not self.use_cache or not os.path.isfile(self.inventory_path):
+            return None
+        
+        digest = hashlib.sha256()
+        for path in (self.inventory_path, self.config_path, __file__):
+            try:
+                with open(path, 'rb') as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+            except FileNotFoundError:
+                digest.update(b'-')
+        digest.update(b'passed' if self._collect_passed else b'counted')
+        digest.update(','.join(sorted(self.checks)).encode())
+        return os.path.join(CACHE_DIR, f"{digest.hexdigest()}.json")
+    
+    def host_cache_path(self) -> Optional[str]:
+        """Per-host results cache, keyed on the config and validator contents"""
+        if not self.use_cache:
+            return None
+        
+        digest = hashlib.sha256()
+        for path in (self.config_path, __file__):
+            try:
+                with open(path, 'rb') as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+            except FileNotFoundError:
+                digest.update(b'-')
+        digest.update(b'passed' if self._collect_passed else b'counted')
+        return os.path.join(CACHE_DIR, f"hosts-{digest.hexdigest()}.json")
+    
+    def load_host_cache(self) -> Optional[Dict[str, list]]:
+        """Cached [vars digest, *HostResults] per hostname, or None when caching is off"""
+        cache_path = self.host_cache_path()
+        if cache_path is None:
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                data = f.read()
+            cache = orjson.loads(data) if orjson is not None else json.loads(data)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+        # Malformed entries are misses, so those hosts are validated again
+        return {hostname: entry for hostname, entry in cache.items()
+                if _valid_host_cache_entry(entry, self._collect_passed)}
+    
+    def save_host_cache(self, entries: Dict[str, list]) -> None:
+        """Replace the per-host results cache with this run's hosts"""
+        cache_path = self.host_cache_path()
+        try:
+            if orjson is not None:
+                _write_cache_file(cache_path, orjson.dumps(entries, default=str))
+            else:
+                _write_cache_file(cache_path, json.dumps(entries, default=str).encode())
+        except (OSError, TypeError) as e:
+            logger.debug(f"Could not write host cache {cache_path}: {e}")
+    
     def run_validation(self) -> Dict[str, Any]:
-        """Run complete inventory validation"""
+        """Run complete inventory validation, reusing the cached report for unchanged inputs"""
+        cache_path = self.report_cache_path()
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    report = json.loads(f.read())
+                self.validation_results = report['results']
+                # The key covers contents only; identical copies share an entry
+                report['timestamp'] = datetime.now().isoformat()
+                report['inventory_path'] = self.inventory_path
+                logger.info(f"Using cached validation report: {cache_path}")
+                return report
+            except (OSError, ValueError, KeyError):
+                pass
+        
+        report = self.validate()
+        
+        # Failed runs are not cached so they are retried next time
+        if cache_path and not any(r['code'] == 'validation_failed' for r in report['results']['critical']):
+            try:
+                _write_cache_file(cache_path, json.dumps(report, default=str).encode())
+            except OSError as e:
+                logger.debug(f"Could not write validation cache {cache_path}: {e}")
+        
+        return report
+    
+    def validate(self) -> Dict[str, Any]:
+        """Run every validation step against the loaded inventory"""
         try:
+            self.compile_rules()
+            
             logger.info(f"Loading inventory from: {self.inventory_path}")
             inventory = self.load_inventory()
             
-            logger.info("Validating inventory structure...")
-            self.validate_inventory_structure(inventory)
-            
-            logger.info("Validating hosts...")
-            self.validate_hosts(inventory)
-            
-            logger.info("Validating group consistency...")
-            self.validate_group_consistency(inventory)
-            
-            logger.info("Validating regional distribution...")
-            self.validate_regional_distribution(inventory)
+            self._scan_inventory(inventory)
             
-            logger.info("Validating capacity distribution...")
-            self.validate_capacity_distribution(inventory)
+            for check, (label, method) in self.CHECKS.items():
+                if check not in self.checks:
+                    continue
+                # Later checks only add noise once the inventory is known to be unusable
+                if self.validation_results['critical']:
+                    logger.info(f"Skipping {label} and later checks after critical issues")
+                    break
+                logger.info(f"Validating {label}...")
+                getattr(self, method)(inventory)
             
             report = self.generate_report()
             logger.info(f"Validation completed with status: {report['status']}")
@@ -496,7 +849,7 @@ class InventoryValidator:
             return report
             
         except Exception as e:
-            self.validation_results['critical'].append(f"Validation failed: {str(e)}")
+            self.validation_results['critical'].append({'code': 'validation_failed', 'reason': str(e)})
             return self.generate_report()
 
 def main():
@@ -506,31 +859,49 @@ def main():
     parser.add_argument('--output', '-o', help='Output file for validation report')
     parser.add_argument('--format', choices=['json', 'yaml', 'text'], default='text',
                        help='Output format')
-    parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    parser.add_argument('--checks', default='all',
+                       help=f"Comma-separated checks to run: {','.join(InventoryValidator.CHECKS)} (default: all)")
+    parser.add_argument('--no-cache', action='store_true',
+                       help=f'Always validate instead of reusing a cached report from {CACHE_DIR}')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Verbose output, including every passed check in the report')
     
     args = parser.parse_args()
     
+    checks = None
+    if args.checks != 'all':
+        checks = [check.strip() for check in args.checks.split(',') if check.strip()]
+        unknown = set(checks) - set(InventoryValidator.CHECKS)
+        if unknown:
+            parser.error(f"unknown checks: {', '.join(sorted(unknown))}")
+    
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    validator = InventoryValidator(args.inventory, args.config)
+    validator = InventoryValidator(args.inventory, args.config, collect_passed=args.verbose,
+                                   use_cache=not args.no_cache, checks=checks)
     report = validator.run_validation()
     
-    # Format output
+    # Format output as encoded chunks; text reports are streamed line by line
     if args.format == 'json':
-        output = json.dumps(report, indent=2)
+        if orjson is not None:
+            # Records can carry raw host values: non-string keys and YAML binaries
+            chunks = [orjson.dumps(report, default=str,
+                                   option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS), b'\n']
+        else:
+            chunks = [json.dumps(report, indent=2, default=str).encode(), b'\n']
     elif args.format == 'yaml':
-        output = yaml.dump(report, default_flow_style=False)
+        chunks = [yaml.dump(report, Dumper=SafeDumper, default_flow_style=False).encode()]
     else:  # text format
-        output = format_text_report(report)
+        chunks = (f"{line}\n".encode() for line in iter_text_report(report))
     
     # Write output
     if args.output:
-        with open(args.output, 'w') as f:
-            f.write(output)
+        with open(args.output, 'wb') as f:
+            f.writelines(chunks)
         print(f"Validation report written to: {args.output}")
     else:
-        print(output)
+        sys.stdout.buffer.writelines(chunks)
     
     # Exit with appropriate code
     status = report['status']
@@ -543,51 +914,58 @@ def main():
     else:
         sys.exit(0)
 
+def format_result(record: Result) -> str:
+    """Render a result record with its message template"""
+    fields = {key: ', '.join(map(str, value)) if key in LIST_FIELDS and isinstance(value, list) else value
+              for key, value in record.items()}
+    return MESSAGES[record['code']].format(**fields)
+
 def format_text_report(report: Dict[str, Any]) -> str:
     """Format validation report as human-readable text"""
-    lines = []
-    lines.append("VPN Infrastructure Inventory Validation Report")
-    lines.append("=" * 50)
-    lines.append(f"Timestamp: {report['timestamp']}")
-    lines.append(f"Inventory: {report['inventory_path']}")
-    lines.append(f"Status: {report['status']}")
-    lines.append("")
+    return "\n".join(iter_text_report(report))
+
+def iter_text_report(report: Dict[str, Any]) -> Iterator[str]:
+    """Yield the lines of the human-readable validation report"""
+    yield "VPN Infrastructure Inventory Validation Report"
+    yield "=" * 50
+    yield f"Timestamp: {report['timestamp']}"
+    yield f"Inventory: {report['inventory_path']}"
+    yield f"Status: {report['status']}"
+    yield ""
     
     summary = report['validation_summary']
-    lines.append("Summary:")
-    lines.append(f"  Total Checks: {summary['total_checks']}")
-    lines.append(f"  Passed: {summary['passed']}")
-    lines.append(f"  Warnings: {summary['warnings']}")
-    lines.append(f"  Errors: {summary['errors']}")
-    lines.append(f"  Critical: {summary['critical']}")
-    lines.append("")
+    yield "Summary:"
+    yield f"  Total Checks: {summary['total_checks']}"
+    yield f"  Passed: {summary['passed']}"
+    yield f"  Warnings: {summary['warnings']}"
+    yield f"  Errors: {summary['errors']}"
+    yield f"  Critical: {summary['critical']}"
+    yield ""
     
     results = report['results']
     
     if results['critical']:
-        lines.append("CRITICAL ISSUES:")
+        yield "CRITICAL ISSUES:"
         for issue in results['critical']:
-            lines.append(f"  ❌ {issue}")
-        lines.append("")
+            yield f"  ❌ {format_result(issue)}"
+        yield ""
     
     if results['errors']:
-        lines.append("ERRORS:")
+        yield "ERRORS:"
         for error in results['errors']:
-            lines.append(f"  ❌ {error}")
-        lines.append("")
+            yield f"  ❌ {format_result(error)}"
+        yield ""
     
     if results['warnings']:
-        lines.append("WARNINGS:")
+        yield "WARNINGS:"
         for warning in results['warnings']:
-            lines.append(f"  ⚠️  {warning}")
-        lines.append("")
+            yield f"  ⚠️  {format_result(warning)}"
+        yield ""
     
     if results['passed']:
-        lines.append("PASSED CHECKS:")
+        yield "PASSED CHECKS:"
         for passed in results['passed']:
-            lines.append(f"  ✅ {passed}")
-    
-    return "\n".join(lines)
+            yield f"  ✅ {format_result(passed)}"
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
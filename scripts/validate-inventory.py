@@ -6,211 +6,366 @@ Validates the Ansible inventory structure without requiring Ansible to be instal
 
 import os
 import sys
-import yaml
+import argparse
+import hashlib
+import json
 import re
 from pathlib import Path
 
+# Results for unchanged inventories are reused from here (shared with validate-inventory-advanced.py)
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                         'inventory-validator')
+
+# Threads used to parse group_vars/host_vars files
+YAML_WORKERS = 8
+
+REQUIRED_GROUPS = [
+    "vpn_servers", "wireguard_servers", "openvpn_servers",
+    "europe", "north_america", "asia_pacific"
+]
+REGIONS = ["europe", "north_america", "asia_pacific"]
+
+GROUP_VARS_FILES = [
+    "inventories/group_vars/all.yml",
+    "inventories/group_vars/vpn_servers.yml",
+    "inventories/group_vars/wireguard_servers.yml",
+    "inventories/group_vars/openvpn_servers.yml",
+    "inventories/group_vars/europe.yml",
+    "inventories/group_vars/north_america.yml",
+    "inventories/group_vars/asia_pacific.yml"
+]
+HOST_VARS_EXAMPLES = [
+    "inventories/host_vars/eu-vpn-wg-01.example.com.yml",
+    "inventories/host_vars/na-vpn-wg-01.example.com.yml",
+    "inventories/host_vars/ap-vpn-wg-01.example.com.yml",
+    "inventories/host_vars/eu-vpn-ovpn-01.example.com.yml"
+]
+
+# One inventory line, surrounding whitespace ignored: a [group] header or a host/child entry
+INVENTORY_LINE_RE = re.compile(
+    r'^[^\S\n]*(?:\[(?P<group>[^\n]*)\]'
+    r'|(?P<entry>(?P<host>[^#\s]\S*)(?P<vars>[^\n]*?)))[^\S\n]*$',
+    re.MULTILINE
+)
+# key=value tokens following the hostname
+HOST_VAR_RE = re.compile(r'(?<!\S)(\S*?)=(\S*)')
+
+# Members of a group that is not declared
+NO_GROUPS = frozenset()
+
 def load_inventory_file(inventory_path):
-    """Parse Ansible inventory file and return structured data"""
+    """Parse Ansible inventory file and return structured data, with group members as sets"""
     inventory = {
         'groups': {},
         'hosts': {},
         'group_children': {},
-        'group_vars': {}
+        'group_vars': {},
+        'all_group_names': set()
     }
     
     current_group = None
+    # Where entries of the current section go; only changes at a section header
+    add_member = None
+    children_section = False
+    hosts = inventory['hosts']
     
-    with open(inventory_path, 'r') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            
-            # Skip comments and empty lines
-            if not line or line.startswith('#'):
-                continue
-            
-            # Group definition
-            if line.startswith('[') and line.endswith(']'):
-                group_name = line[1:-1]
-                
-                # Check for children groups
-                if ':children' in group_name:
-                    parent_group = group_name.replace(':children', '')
-                    current_group = parent_group
-                    inventory['group_children'][parent_group] = []
-                else:
-                    current_group = group_name
-                    inventory['groups'][current_group] = []
-                continue
+    # Comments and empty lines never match, so the scan only visits headers and entries
+    text = Path(inventory_path).read_text()
+    for match in INVENTORY_LINE_RE.finditer(text):
+        group_name = match.group('group')
+        
+        # Group definition
+        if group_name is not None:
+            # Check for children groups
+            if ':children' in group_name:
+                parent_group = group_name.replace(':children', '')
+                current_group = parent_group
+                inventory['group_children'][parent_group] = set()
+            else:
+                current_group = group_name
+                inventory['groups'][current_group] = set()
+            inventory['all_group_names'].add(current_group)
             
-            # Host or child group definition
-            if current_group:
-                if current_group in inventory['group_children']:
-                    # This is a child group
-                    inventory['group_children'][current_group].append(line)
-                else:
-                    # This is a host
-                    host_parts = line.split()
-                    hostname = host_parts[0]
-                    host_vars = {}
-                    
-                    # Parse host variables
-                    for part in host_parts[1:]:
-                        if '=' in part:
-                            key, value = part.split('=', 1)
-                            host_vars[key] = value
-                    
-                    inventory['groups'][current_group].append(hostname)
-                    inventory['hosts'][hostname] = host_vars
+            # A group declared with :children keeps taking child groups under a plain header too
+            children_section = current_group in inventory['group_children']
+            if not current_group:
+                add_member = None
+            elif children_section:
+                add_member = inventory['group_children'][current_group].add
+            else:
+                add_member = inventory['groups'][current_group].add
+            continue
+        
+        # Host or child group definition
+        if add_member is None:
+            continue
+        if children_section:
+            # This is a child group
+            add_member(match.group('entry'))
+        else:
+            # This is a host
+            hostname = match.group('host')
+            var_text = match.group('vars')
+            add_member(hostname)
+            hosts[hostname] = dict(HOST_VAR_RE.findall(var_text)) if '=' in var_text else {}
     
     return inventory
 
-def validate_inventory_structure():
-    """Validate the complete inventory structure"""
-    print("=== VPN Infrastructure Inventory Validation ===")
-    print()
+def count_hosts_in_group(group_name, inventory, cache):
+    """Collect hosts in a group including all descendant groups, memoized in cache"""
+    if group_name in cache:
+        return cache[group_name]
     
-    # Check if inventory file exists
-    inventory_path = Path("inventories/production")
-    if not inventory_path.exists():
-        print(f"❌ ERROR: Inventory file not found: {inventory_path}")
-        return False
+    groups = inventory['groups']
+    group_children = inventory['group_children']
+    total_hosts = set()
     
-    print("✅ Inventory file found")
+    # Iterative walk of the child groups; seen also guards against cyclic declarations
+    seen = {group_name}
+    stack = [group_name]
+    while stack:
+        group = stack.pop()
+        if group in cache:
+            total_hosts |= cache[group]
+            continue
+        
+        # Add direct hosts
+        total_hosts |= groups.get(group, NO_GROUPS)
+        
+        # Queue child groups not visited yet
+        for child_group in group_children.get(group, NO_GROUPS):
+            if child_group not in seen:
+                seen.add(child_group)
+                stack.append(child_group)
     
-    # Load and parse inventory
+    cache[group_name] = frozenset(total_hosts)
+    return cache[group_name]
+
+def list_dir_names(directory):
+    """Names of the entries in a directory, empty if it does not exist"""
     try:
-        inventory = load_inventory_file(inventory_path)
-        print("✅ Inventory parsed successfully")
-    except Exception as e:
-        print(f"❌ ERROR: Failed to parse inventory: {e}")
-        return False
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+def _parse_yaml(file_path):
+    """Syntax error of a YAML file, or None if it parses"""
+    import yaml
     
-    # Check required groups
-    print("🔍 Checking required inventory groups...")
-    required_groups = [
-        "vpn_servers", "wireguard_servers", "openvpn_servers",
-        "europe", "north_america", "asia_pacific"
-    ]
+    # Use the libyaml C bindings when PyYAML was built with them
+    SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    try:
+        # One loader per file keeps error marks pointing at the right file and line;
+        # composing the node tree checks syntax without building Python objects
+        with open(file_path, 'r') as f:
+            yaml.compose(f, Loader=SafeLoader)
+    except yaml.YAMLError as e:
+        return e
+    return None
+
+def check_yaml_files(file_paths):
+    """Check that each file exists and parses as YAML: (file_path, found, syntax error or None)"""
+    # One directory listing per parent instead of a stat() per file
+    dir_names = {}
+    present = []
+    for file_path in file_paths:
+        path = Path(file_path)
+        if path.parent not in dir_names:
+            dir_names[path.parent] = list_dir_names(path.parent)
+        if path.name in dir_names[path.parent]:
+            present.append(file_path)
     
-    all_groups = set(inventory['groups'].keys()) | set(inventory['group_children'].keys())
+    # The files are independent and libyaml releases the GIL while parsing
+    errors = {}
+    if present:
+        # Only needed when the cached results are stale; PyYAML is imported
+        # here so the worker threads do not race to initialise it
+        from concurrent.futures import ThreadPoolExecutor
+        import yaml  # noqa: F401
+        with ThreadPoolExecutor(max_workers=min(YAML_WORKERS, len(present))) as executor:
+            errors = dict(zip(present, executor.map(_parse_yaml, present)))
     
-    for group in required_groups:
-        if group in all_groups:
-            print(f"✅ Group '{group}' found")
-        else:
-            print(f"❌ ERROR: Required group '{group}' not found")
-            return False
+    return [(file_path, file_path in errors, errors.get(file_path)) for file_path in file_paths]
+
+def run_checks(inventory, gv_paths=GROUP_VARS_FILES, hv_paths=HOST_VARS_EXAMPLES):
+    """Evaluate the structural checks and the group_vars/host_vars YAML files into plain data"""
+    all_groups = inventory['all_group_names']
     
-    # Count servers by region
-    print("🔍 Counting servers by region...")
-    regions = ["europe", "north_america", "asia_pacific"]
+    # group_vars and host_vars are parsed in one batch
+    yaml_results = [[file_path, found, None if error is None else str(error)]
+                    for file_path, found, error in check_yaml_files(list(gv_paths) + list(hv_paths))]
     
-    def count_hosts_in_group(group_name, inventory):
-        """Recursively count hosts in a group including children"""
-        total_hosts = set()
-        
-        # Add direct hosts
-        if group_name in inventory['groups']:
-            total_hosts.update(inventory['groups'][group_name])
-        
-        # Add hosts from child groups
-        if group_name in inventory['group_children']:
-            for child_group in inventory['group_children'][group_name]:
-                child_hosts = count_hosts_in_group(child_group, inventory)
-                total_hosts.update(child_hosts)
-        
-        return total_hosts
+    # Hosts per group, shared by the region and protocol counts
+    group_hosts = {}
+    return {
+        'missing_groups': sorted(set(REQUIRED_GROUPS) - all_groups),
+        'region_counts': [[region, len(count_hosts_in_group(region, inventory, group_hosts))] for region in REGIONS],
+        'wireguard_servers': len(count_hosts_in_group("wireguard_servers", inventory, group_hosts)),
+        'openvpn_servers': len(count_hosts_in_group("openvpn_servers", inventory, group_hosts)),
+        'group_vars': yaml_results[:len(gv_paths)],
+        'host_vars': yaml_results[len(gv_paths):]
+    }
+
+def iter_checks(results):
+    """(section, ok, message, error message, nested) for every check in report order"""
+    missing_groups = set(results['missing_groups'])
+    total_servers = sum(count for _, count in results['region_counts'])
     
-    total_servers = 0
-    for region in regions:
-        hosts = count_hosts_in_group(region, inventory)
-        count = len(hosts)
-        total_servers += count
-        
-        if count == 10:
-            print(f"✅ Region '{region}': {count} servers (expected: 10)")
-        else:
-            print(f"❌ ERROR: Region '{region}': {count} servers (expected: 10)")
-            return False
+    section = "Checking required inventory groups"
+    for group in REQUIRED_GROUPS:
+        yield section, group not in missing_groups, f"Group '{group}' found", f"Required group '{group}' not found", False
     
-    # Count servers by protocol
-    print("🔍 Counting servers by protocol...")
-    wg_hosts = count_hosts_in_group("wireguard_servers", inventory)
-    ovpn_hosts = count_hosts_in_group("openvpn_servers", inventory)
+    section = "Counting servers by region"
+    for region, count in results['region_counts']:
+        message = f"Region '{region}': {count} servers (expected: 10)"
+        yield section, count == 10, message, message, False
     
-    print(f"✅ WireGuard servers: {len(wg_hosts)}")
-    print(f"✅ OpenVPN servers: {len(ovpn_hosts)}")
+    section = "Counting servers by protocol"
+    yield section, True, f"WireGuard servers: {results['wireguard_servers']}", None, False
+    yield section, True, f"OpenVPN servers: {results['openvpn_servers']}", None, False
+    message = f"Total VPN servers: {total_servers} (expected: 30)"
+    yield section, total_servers == 30, message, message, False
     
-    if total_servers == 30:
-        print(f"✅ Total VPN servers: {total_servers} (expected: 30)")
-    else:
-        print(f"❌ ERROR: Total VPN servers: {total_servers} (expected: 30)")
+    for section, key, description in [("Checking group_vars files", 'group_vars', "group_vars file"),
+                                      ("Checking host_vars examples", 'host_vars', "host_vars example")]:
+        for file_path, found, error in results[key]:
+            yield section, found, f"Found: {file_path}", f"Missing {description}: {file_path}", False
+            if found:
+                yield (section, error is None, "Valid YAML syntax",
+                       f"Invalid YAML syntax in {file_path}: {error}", True)
+
+def collect_errors(inventory, gv_paths=GROUP_VARS_FILES, hv_paths=HOST_VARS_EXAMPLES):
+    """Every problem found in a parsed inventory and its group_vars/host_vars files"""
+    return [error for _, ok, _, error, _ in iter_checks(run_checks(inventory, gv_paths, hv_paths)) if not ok]
+
+def input_stamps(inventory_path):
+    """(path, mtime, size) of every input, with None for missing files"""
+    stamps = []
+    for path in [str(inventory_path), *GROUP_VARS_FILES, *HOST_VARS_EXAMPLES, __file__]:
+        try:
+            st = os.stat(path)
+            stamps.append([path, st.st_mtime_ns, st.st_size])
+        except FileNotFoundError:
+            stamps.append([path, None, None])
+    return stamps
+
+def cache_file():
+    """Results cache for inventories under the current directory"""
+    cwd_key = hashlib.sha256(os.getcwd().encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"validate-inventory-{cwd_key}.json")
+
+def load_cached_results(stamps):
+    """Check results from the last run if none of its inputs changed since"""
+    try:
+        with open(cache_file(), 'r') as f:
+            cached = json.load(f)
+        if cached['stamps'] == stamps:
+            return cached['results']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def save_cached_results(stamps, results):
+    """Store check results keyed on the input stamps"""
+    cache_path = cache_file()
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump({'stamps': stamps, 'results': results}, f)
+        # Atomic swap, so a concurrent run never reads a partial cache
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+def report_inventory_structure(emit, verbose=False, use_cache=True):
+    """Validate the complete inventory structure, passing each report line to emit"""
+    emit("=== VPN Infrastructure Inventory Validation ===")
+    emit("")
+    
+    # Check if inventory file exists
+    inventory_path = Path("inventories/production")
+    if not inventory_path.exists():
+        emit(f"❌ ERROR: Inventory file not found: {inventory_path}")
         return False
     
-    # Check group_vars files
-    print("🔍 Checking group_vars files...")
-    group_vars_files = [
-        "inventories/group_vars/all.yml",
-        "inventories/group_vars/vpn_servers.yml",
-        "inventories/group_vars/wireguard_servers.yml",
-        "inventories/group_vars/openvpn_servers.yml",
-        "inventories/group_vars/europe.yml",
-        "inventories/group_vars/north_america.yml",
-        "inventories/group_vars/asia_pacific.yml"
-    ]
-    
-    for file_path in group_vars_files:
-        path = Path(file_path)
-        if path.exists():
-            print(f"✅ Found: {file_path}")
-            try:
-                with open(path, 'r') as f:
-                    yaml.safe_load(f)
-                print(f"  ✅ Valid YAML syntax")
-            except yaml.YAMLError as e:
-                print(f"  ❌ ERROR: Invalid YAML syntax in {file_path}: {e}")
-                return False
-        else:
-            print(f"❌ ERROR: Missing group_vars file: {file_path}")
+    if verbose:
+        emit("✅ Inventory file found")
+    
+    # Reuse the previous results while the inventory and YAML files are unchanged
+    stamps = input_stamps(inventory_path) if use_cache else None
+    results = load_cached_results(stamps) if use_cache else None
+    if results is None:
+        # Load and parse inventory
+        try:
+            inventory = load_inventory_file(inventory_path)
+        except Exception as e:
+            emit(f"❌ ERROR: Failed to parse inventory: {e}")
             return False
+        
+        # Run every check first; output is produced afterwards in one block
+        results = run_checks(inventory)
+        if use_cache:
+            save_cached_results(stamps, results)
     
-    # Check host_vars examples
-    print("🔍 Checking host_vars examples...")
-    host_vars_examples = [
-        "inventories/host_vars/eu-vpn-wg-01.example.com.yml",
-        "inventories/host_vars/na-vpn-wg-01.example.com.yml",
-        "inventories/host_vars/ap-vpn-wg-01.example.com.yml",
-        "inventories/host_vars/eu-vpn-ovpn-01.example.com.yml"
-    ]
+    if verbose:
+        emit("✅ Inventory parsed successfully")
     
-    for file_path in host_vars_examples:
-        path = Path(file_path)
-        if path.exists():
-            print(f"✅ Found: {file_path}")
-            try:
-                with open(path, 'r') as f:
-                    yaml.safe_load(f)
-                print(f"  ✅ Valid YAML syntax")
-            except yaml.YAMLError as e:
-                print(f"  ❌ ERROR: Invalid YAML syntax in {file_path}: {e}")
-                return False
-        else:
-            print(f"❌ ERROR: Missing host_vars example: {file_path}")
-            return False
+    checks = list(iter_checks(results))
+    success = all(ok for _, ok, _, _, _ in checks)
     
-    print()
-    print("🎉 Inventory validation completed successfully!")
-    print("📊 Summary:")
-    print("   - Total servers: 30")
-    print("   - Regions: 3 (10 servers each)")
-    print(f"   - Protocols: WireGuard ({len(wg_hosts)}), OpenVPN ({len(ovpn_hosts)})")
-    print("   - Group variables: 7 files")
-    print("   - Host variables: 4 example files")
-    print()
+    # Per-check report: everything when verbose, otherwise just the failures
+    if verbose:
+        current_section = None
+        for section, ok, message, error_message, nested in checks:
+            if section != current_section:
+                emit(f"🔍 {section}...")
+                current_section = section
+            # Nested results sit under the line they belong to
+            indent = "  " if nested else ""
+            emit(f"{indent}✅ {message}" if ok else f"{indent}❌ ERROR: {error_message}")
+    else:
+        for _, ok, _, error_message, _ in checks:
+            if not ok:
+                emit(f"❌ ERROR: {error_message}")
+    
+    if not success:
+        return False
+    
+    if verbose:
+        emit("")
+    emit("🎉 Inventory validation completed successfully!")
+    emit("📊 Summary:")
+    emit("   - Total servers: 30")
+    emit("   - Regions: 3 (10 servers each)")
+    emit(f"   - Protocols: WireGuard ({results['wireguard_servers']}), OpenVPN ({results['openvpn_servers']})")
+    emit("   - Group variables: 7 files")
+    emit("   - Host variables: 4 example files")
+    emit("")
     
     return True
 
+def validate_inventory_structure(verbose=False, use_cache=True):
+    """Validate the complete inventory structure, listing every check only when verbose"""
+    # The report is written in one go rather than one syscall per line
+    lines = []
+    try:
+        return report_inventory_structure(lines.append, verbose, use_cache)
+    finally:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate the VPN infrastructure inventory structure')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='List every check, not just failures')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Always re-parse instead of reusing results from {CACHE_DIR}')
+    args = parser.parse_args()
+    
+    success = validate_inventory_structure(verbose=args.verbose, use_cache=not args.no_cache)
+    sys.exit(0 if success else 1)
+
 if __name__ == "__main__":
-    success = validate_inventory_structure()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    main()